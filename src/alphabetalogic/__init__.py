@@ -1,3 +1,5 @@
 from .tableaux import check_if_tautology, Tree
+from .batch import check_many
+from .asynchronous import acheck_satisfiable, acheck_tautology
 
-__all__ = ['check_if_tautology', 'Tree']
\ No newline at end of file
+__all__ = ['acheck_satisfiable', 'acheck_tautology', 'check_if_tautology', 'check_many', 'Tree']
@@ -0,0 +1,165 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Optional
+
+from .budget import Budget, BudgetExceeded
+from .formula import Negation
+from .parser import get_parser, parse_formula
+from .tableaux_decision import tableau_closes
+
+
+def is_tautology(formula: str, budget: Budget = None) -> Optional[bool]:
+    """Return True if the formula (not negated) is true in every assignment, None if the budget ran out."""
+    meter = None if budget is None else budget.start()
+    try:
+        return tableau_closes(Negation(arguments=[parse_formula(formula)]), meter=meter)
+    except BudgetExceeded:
+        return None
+
+
+def is_satisfiable(formula: str, budget: Budget = None) -> Optional[bool]:
+    """Return True if the formula is true in some assignment, None if the budget ran out."""
+    meter = None if budget is None else budget.start()
+    try:
+        return not tableau_closes(parse_formula(formula), meter=meter)
+    except BudgetExceeded:
+        return None
+
+
+class AsyncChecker:
+    """
+    Run checks from asyncio code without blocking the event loop.
+
+    Checks are offloaded to an executor, by default a pool of processes owned by the
+    checker. At most ``max_concurrency`` checks run or wait in the executor at once;
+    further calls wait on a semaphore, which is the backpressure for callers. A call
+    that is cancelled, or whose ``timeout`` expires, before its check has started
+    removes the check from the executor; a check that has already started runs to its
+    end in its worker, but its result is dropped. A ``budget`` bounds that work: the
+    worker gives up on its own and the result is None.
+
+    Parameters
+    ----------
+    workers: int
+        Number of processes of the default executor; ``os.cpu_count()`` if not given.
+    max_concurrency: int
+        Number of checks submitted at once; ``workers`` if not given.
+    executor: Executor
+        Executor to use instead of a new process pool; it is not shut down by ``close``.
+    """
+
+    def __init__(self, workers: int = None, max_concurrency: int = None, executor: Executor = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers
+        self._owns_executor = executor is None
+        self._executor = executor
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the executor created by the checker."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def run(self, function: Callable, formula: str, timeout: float = None):
+        """
+        Run ``function(formula)`` in the executor.
+
+        Parameters
+        ----------
+        function: callable
+            Module level function, so that it can be sent to a worker process.
+        formula: str
+            Argument of the function.
+        timeout: float
+            Seconds to wait for the result, including the time spent waiting for a free
+            slot; ``asyncio.TimeoutError`` is raised when they run out.
+
+        Returns
+        -------
+        object
+            The result of the function.
+        """
+        return await asyncio.wait_for(self._run(function, formula), timeout)
+
+    async def _run(self, function: Callable, formula: str):
+        if self._semaphore is None:
+            # created here, so that it belongs to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=get_parser)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, formula)
+
+    async def check_tautology(
+        self, formula: str, timeout: float = None, budget: Budget = None
+    ) -> Optional[bool]:
+        """Check whether the formula is a tautology; None if the ``budget`` ran out."""
+        return await self.run(functools.partial(is_tautology, budget=budget), formula, timeout)
+
+    async def check_satisfiable(
+        self, formula: str, timeout: float = None, budget: Budget = None
+    ) -> Optional[bool]:
+        """Check whether the formula is satisfiable; None if the ``budget`` ran out."""
+        return await self.run(functools.partial(is_satisfiable, budget=budget), formula, timeout)
+
+
+_default_checker = None
+
+
+def get_default_checker() -> AsyncChecker:
+    """Return the checker used by ``acheck_tautology`` and ``acheck_satisfiable``."""
+    global _default_checker
+    if _default_checker is None:
+        _default_checker = AsyncChecker()
+    return _default_checker
+
+
+async def acheck_tautology(formula: str, timeout: float = None, budget: Budget = None) -> Optional[bool]:
+    """
+    Check whether the formula is a tautology without blocking the event loop.
+
+    Parameters
+    ----------
+    formula: str
+        The formula, not negated.
+    timeout: float
+        Seconds to wait for the result before ``asyncio.TimeoutError`` is raised.
+    budget: Budget
+        Limits of the check in the worker.
+
+    Returns
+    -------
+    bool
+        True if the formula is true in every assignment; None if the budget ran out.
+    """
+    return await get_default_checker().check_tautology(formula, timeout, budget)
+
+
+async def acheck_satisfiable(formula: str, timeout: float = None, budget: Budget = None) -> Optional[bool]:
+    """
+    Check whether the formula is satisfiable without blocking the event loop.
+
+    Parameters
+    ----------
+    formula: str
+        The formula.
+    timeout: float
+        Seconds to wait for the result before ``asyncio.TimeoutError`` is raised.
+    budget: Budget
+        Limits of the check in the worker.
+
+    Returns
+    -------
+    bool
+        True if the formula is true in some assignment; None if the budget ran out.
+    """
+    return await get_default_checker().check_satisfiable(formula, timeout, budget)
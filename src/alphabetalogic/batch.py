@@ -0,0 +1,112 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, List
+
+from .budget import Budget
+from .parser import get_parser
+from .tableaux import check_if_tautology
+
+
+def _check_chunk(formulas: List[str], budget: Budget = None) -> List[bool]:
+    # the parser is built once per process and reused for every formula
+    return [check_if_tautology(formula, budget=budget) for formula in formulas]
+
+
+def _chunks(formulas: Iterable[str], chunksize: int) -> Iterator[List[str]]:
+    iterator = iter(formulas)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def check_many(
+    formulas: Iterable[str],
+    workers: int = None,
+    chunksize: int = 64,
+    ordered: bool = True,
+    budget: Budget = None,
+) -> Iterator:
+    """
+    Check many formulas with the tableaux method, in a pool of processes.
+
+    Inputs are read lazily, in chunks of ``chunksize`` formulas, and at most two chunks
+    per worker are in flight, so the input can be a generator of any length. Every worker
+    builds the parser once and checks whole chunks with the decision-only tableau, so
+    the per-formula overhead is one list item rather than one task.
+
+    Parameters
+    ----------
+    formulas: iterable of str
+        Formulas in the form taken by ``check_if_tautology`` (negated candidates).
+    workers: int
+        Number of processes; ``os.cpu_count()`` if not given. With 1 the formulas are
+        checked in this process.
+    chunksize: int
+        Number of formulas sent to a worker at once.
+    ordered: bool
+        Yield results in input order; otherwise yield ``(index, result)`` pairs as the
+        chunks complete.
+    budget: Budget
+        Limits of the check of every single formula, so that one formula that blows up
+        does not hold a worker; its result is then None.
+
+    Yields
+    ------
+    bool or tuple
+        The result of ``check_if_tautology`` for every formula, or ``(index, result)``.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(formulas, chunksize)
+
+    if workers == 1:
+        start = 0
+        for chunk in chunks:
+            results = _check_chunk(chunk, budget)
+            if ordered:
+                yield from results
+            else:
+                yield from enumerate(results, start)
+            start += len(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=get_parser) as executor:
+        in_flight = deque()
+        start = 0
+
+        def submit():
+            nonlocal start
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            in_flight.append((start, executor.submit(_check_chunk, chunk, budget)))
+            start += len(chunk)
+            return True
+
+        for _ in range(2 * workers):
+            if not submit():
+                break
+
+        try:
+            while in_flight:
+                if ordered:
+                    _, future = in_flight.popleft()
+                    results = future.result()
+                    submit()
+                    yield from results
+                    continue
+
+                done, _ = wait([future for _, future in in_flight], return_when=FIRST_COMPLETED)
+                for item in [item for item in in_flight if item[1] in done]:
+                    in_flight.remove(item)
+                    submit()
+                    yield from enumerate(item[1].result(), item[0])
+        finally:
+            # a consumer that stops early does not wait for the chunks not yet started
+            for _, future in in_flight:
+                future.cancel()
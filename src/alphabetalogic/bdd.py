@@ -0,0 +1,345 @@
+from typing import Dict, Iterable, Optional, Union
+
+from .budget import BudgetMeter
+from .dag import CONJUNCTION, DISJUNCTION, EQUALITY, IMPLICATION, NEGATION, VARIABLE, FormulaTable, Node
+from .formula import Formula
+from .results import CONTRADICTION, SATISFIABLE, TAUTOLOGY, CheckResult
+
+FALSE = 0
+TRUE = 1
+
+
+class BDDManager:
+    """
+    Reduced ordered binary decision diagrams sharing one unique table.
+
+    A BDD is an int, the index of its root in the arrays of the manager; ``FALSE`` and
+    ``TRUE`` are the terminals. Nodes are hash-consed by (level, low, high) and a node
+    whose two children are equal is never built, so every function has exactly one
+    node and two BDDs are equivalent exactly when their indices are equal. All
+    operations go through ``ite`` (if-then-else), whose results are memoized in a
+    direct-mapped cache of ``cache_size`` slots: a new result overwrites the slot of its
+    hash, which bounds the memory of the cache. ``ite`` runs on an explicit stack.
+
+    Variables are ordered by the time they are registered; ``from_formula`` registers
+    the new letters of a formula in sorted order. Nodes are never freed one by one:
+    ``close`` releases all of them, and the manager is a context manager.
+
+    Parameters
+    ----------
+    cache_size: int
+        Slots of the operation cache; rounded up to a power of two.
+    """
+
+    def __init__(self, cache_size: int = 1 << 16):
+        size = 1
+        while size < cache_size:
+            size <<= 1
+        self._cache_mask = size - 1
+        self._cache = [None] * size
+        self.levels = {}
+        self.letters = []
+        # the terminals sit below every variable
+        self.level = [None, None]
+        self.low = [FALSE, TRUE]
+        self.high = [FALSE, TRUE]
+        self._unique = {}
+
+    def __len__(self):
+        """Number of nodes, terminals included."""
+        return len(self.low)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release every node and the cache; the BDDs of the manager become invalid."""
+        self._unique = {}
+        self._cache = [None] * (self._cache_mask + 1)
+        self.level = [None, None]
+        self.low = [FALSE, TRUE]
+        self.high = [FALSE, TRUE]
+        self.levels = {}
+        self.letters = []
+
+    def _level(self, node: int) -> int:
+        level = self.level[node]
+        return len(self.letters) if level is None else level
+
+    def _make(self, level: int, low: int, high: int, meter: BudgetMeter = None) -> int:
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            if meter is not None:
+                meter.charge(nodes=1)
+            node = len(self.low)
+            self.level.append(level)
+            self.low.append(low)
+            self.high.append(high)
+            self._unique[key] = node
+        return node
+
+    def variable(self, letter: str) -> int:
+        """BDD of a variable; the letter is registered below the existing ones if it is new."""
+        level = self.levels.get(letter)
+        if level is None:
+            level = self.levels[letter] = len(self.letters)
+            self.letters.append(letter)
+        return self._make(level, FALSE, TRUE)
+
+    def ite(self, f: int, g: int, h: int, meter: BudgetMeter = None) -> int:
+        """BDD of ``(f and g) or (~f and h)``."""
+        cache = self._cache
+        mask = self._cache_mask
+        results = []
+        stack = [(f, g, h, None)]
+        while stack:
+            f, g, h, level = stack.pop()
+            if level is not None:
+                # both cofactors are done: build the node
+                high = results.pop()
+                low = results.pop()
+                node = self._make(level, low, high, meter)
+                cache[hash((f, g, h)) & mask] = (f, g, h, node)
+                results.append(node)
+                continue
+            if f == TRUE or g == h:
+                results.append(g)
+                continue
+            if f == FALSE:
+                results.append(h)
+                continue
+            if g == TRUE and h == FALSE:
+                results.append(f)
+                continue
+            entry = cache[hash((f, g, h)) & mask]
+            if entry is not None and entry[0] == f and entry[1] == g and entry[2] == h:
+                results.append(entry[3])
+                continue
+            top = min(self._level(f), self._level(g), self._level(h))
+            f0, f1 = self._cofactors(f, top)
+            g0, g1 = self._cofactors(g, top)
+            h0, h1 = self._cofactors(h, top)
+            stack.append((f, g, h, top))
+            stack.append((f1, g1, h1, None))
+            stack.append((f0, g0, h0, None))
+        return results[0]
+
+    def _cofactors(self, node: int, level: int) -> tuple:
+        if self.level[node] == level:
+            return self.low[node], self.high[node]
+        return node, node
+
+    def negate(self, f: int, meter: BudgetMeter = None) -> int:
+        """BDD of ``~f``."""
+        return self.ite(f, FALSE, TRUE, meter)
+
+    def apply(self, kind: str, f: int, g: int, meter: BudgetMeter = None) -> int:
+        """BDD of a binary connective, named like the ``dag`` node kinds."""
+        if kind == CONJUNCTION:
+            return self.ite(f, g, FALSE, meter)
+        if kind == DISJUNCTION:
+            return self.ite(f, TRUE, g, meter)
+        if kind == IMPLICATION:
+            return self.ite(f, g, TRUE, meter)
+        if kind == EQUALITY:
+            return self.ite(f, g, self.negate(g, meter), meter)
+        raise ValueError(f"Unknown connective: {kind}")
+
+    def from_formula(self, formula: Union[Formula, Node], meter: BudgetMeter = None) -> int:
+        """
+        Build the BDD of a formula.
+
+        The formula is interned first, so a subformula that occurs several times is
+        built once; its letters that are new to the manager are registered in sorted
+        order.
+
+        Parameters
+        ----------
+        formula: Formula or Node
+            The formula.
+        meter: BudgetMeter
+            If given, every new node is charged to it as a tableau node would be.
+
+        Returns
+        -------
+        int
+            The BDD.
+        """
+        root = formula if isinstance(formula, Node) else FormulaTable().intern(formula)
+        seen = set()
+        letters = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.id not in seen:
+                seen.add(node.id)
+                if node.kind == VARIABLE:
+                    letters.add(node.letter)
+                stack.extend(node.arguments)
+        for letter in sorted(letters):
+            self.variable(letter)
+
+        built = {}
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if node.id in built:
+                stack.pop()
+                continue
+            pending = [argument for argument in node.arguments if argument.id not in built]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if node.kind == VARIABLE:
+                bdd = self.variable(node.letter)
+            elif node.kind == NEGATION:
+                bdd = self.negate(built[node.arguments[0].id], meter)
+            else:
+                left, right = (built[argument.id] for argument in node.arguments)
+                bdd = self.apply(node.kind, left, right, meter)
+            built[node.id] = self.negate(bdd, meter) if node.negation else bdd
+        return built[root.id]
+
+    def support(self, f: int) -> list:
+        """Letters the BDD depends on, in variable order."""
+        levels = set()
+        for node in self._nodes(f):
+            levels.add(self.level[node])
+        return [self.letters[level] for level in sorted(levels)]
+
+    def _nodes(self, f: int) -> list:
+        """Internal nodes reachable from ``f``, children before parents."""
+        order = []
+        seen = set()
+        stack = [(f, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node <= TRUE:
+                continue
+            if expanded:
+                order.append(node)
+                continue
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.append((node, True))
+            stack.append((self.high[node], False))
+            stack.append((self.low[node], False))
+        return order
+
+    def size(self, f: int) -> int:
+        """Number of internal nodes of the BDD."""
+        return len(self._nodes(f))
+
+    def count_models(self, f: int, letters: Iterable[str] = None) -> int:
+        """
+        Count the satisfying assignments.
+
+        Parameters
+        ----------
+        f: int
+            The BDD.
+        letters: iterable of str
+            Variables to count assignments of; they must include the support of ``f``.
+            The support if not given.
+
+        Returns
+        -------
+        int
+            Number of assignments of the variables that make ``f`` true.
+        """
+        support = self.support(f)
+        extra = 0 if letters is None else len(set(letters)) - len(support)
+        if extra < 0 or letters is not None and not set(support) <= set(letters):
+            raise ValueError("the letters must include the support of the BDD")
+        # position of every support level among the support, terminals last
+        position = {self.levels[letter]: index for index, letter in enumerate(support)}
+        bottom = len(support)
+
+        def rank(node):
+            return bottom if node <= TRUE else position[self.level[node]]
+
+        counts = {FALSE: 0, TRUE: 1}
+        for node in self._nodes(f):
+            here = rank(node)
+            low, high = self.low[node], self.high[node]
+            counts[node] = (counts[low] << (rank(low) - here - 1)) + (counts[high] << (rank(high) - here - 1))
+        return (counts[f] << rank(f)) << extra
+
+    def find_assignment(self, f: int, value: bool = True) -> Optional[Dict[str, int]]:
+        """
+        Return an assignment of the support of ``f`` under which it has the given value.
+
+        Returns
+        -------
+        dict
+            Value, 0 or 1, of every letter in the support, or None if there is none.
+        """
+        target = TRUE if value else FALSE
+        if f == target:
+            return {}
+        if f <= TRUE:
+            return None
+        # nodes from which the target terminal can be reached
+        reaches = {target}
+        for node in self._nodes(f):
+            if self.low[node] in reaches or self.high[node] in reaches:
+                reaches.add(node)
+        if f not in reaches:
+            return None
+        assignment = {letter: 0 for letter in self.support(f)}
+        node = f
+        while node > TRUE:
+            letter = self.letters[self.level[node]]
+            if self.low[node] in reaches:
+                node = self.low[node]
+            else:
+                assignment[letter] = 1
+                node = self.high[node]
+        return assignment
+
+    def equivalent(self, first: Union[Formula, Node, int], second: Union[Formula, Node, int]) -> bool:
+        """Decide whether two formulas, or BDDs of this manager, are equivalent."""
+        if not isinstance(first, int):
+            first = self.from_formula(first)
+        if not isinstance(second, int):
+            second = self.from_formula(second)
+        return first == second
+
+
+def check_bdd(formula: Formula, meter: BudgetMeter = None) -> CheckResult:
+    """
+    Classify a formula by its BDD, in a manager of its own.
+
+    The verdict is read from the terminals: the formula is a tautology if its BDD is
+    ``TRUE`` and a contradiction if it is ``FALSE``.
+
+    Parameters
+    ----------
+    formula: Formula
+        The formula, not negated.
+    meter: BudgetMeter
+        If given, every new BDD node is charged to it.
+
+    Returns
+    -------
+    CheckResult
+        The verdict, a falsifying assignment of every variable, and the size of the BDD
+        and its number of models in ``stats``.
+    """
+    with BDDManager() as manager:
+        bdd = manager.from_formula(formula, meter)
+        letters = list(manager.letters)
+        stats = {"nodes": manager.size(bdd), "models": manager.count_models(bdd, letters)}
+        if bdd == TRUE:
+            return CheckResult(TAUTOLOGY, None, stats)
+        counterexample = dict.fromkeys(sorted(letters), 0)
+        counterexample.update(manager.find_assignment(bdd, False))
+        return CheckResult(CONTRADICTION if bdd == FALSE else SATISFIABLE, counterexample, stats)
@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# the clock and the memory are read once per this many charges, counts on every charge
+_POLL_INTERVAL = 1024
+
+
+def _resident_memory() -> int:
+    """Resident memory of the process in bytes, or 0 if it cannot be measured."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # the peak rather than the current size; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return 0
+
+
+@dataclass(frozen=True)
+class Budget:
+    """
+    Limits on the work of a single check; a limit that is None is not enforced.
+
+    Attributes
+    ----------
+    max_nodes: int
+        Tableau nodes that may be added.
+    max_branches: int
+        Tableau branches that may be opened.
+    timeout: float
+        Wall clock seconds, measured from the start of the check.
+    max_memory: int
+        Approximate ceiling, in bytes, on the resident memory of the process.
+    """
+
+    max_nodes: Optional[int] = None
+    max_branches: Optional[int] = None
+    timeout: Optional[float] = None
+    max_memory: Optional[int] = None
+
+    def start(self) -> "BudgetMeter":
+        """Return a meter for a check starting now."""
+        return BudgetMeter(self)
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised by an engine that ran out of its budget.
+
+    Attributes
+    ----------
+    reason: str
+        The limit that was exceeded: ``"nodes"``, ``"branches"``, ``"time"`` or ``"memory"``.
+    stats: dict
+        The work done up to that point.
+    """
+
+    def __init__(self, reason: str, stats: dict):
+        super().__init__(f"budget exceeded: {reason}")
+        self.reason = reason
+        self.stats = stats
+
+
+class BudgetMeter:
+    """
+    Work done by a running check, compared with its budget.
+
+    Engines call ``charge`` from their main loop. Node and branch counts are compared
+    on every call; the clock and the memory, which cost more to read, every
+    ``_POLL_INTERVAL`` calls and on every ``poll``.
+    """
+
+    def __init__(self, budget: Budget):
+        self.budget = budget
+        self.started = time.monotonic()
+        self.deadline = None if budget.timeout is None else self.started + budget.timeout
+        self.nodes = 0
+        self.branches = 0
+        self.rows = 0
+        self._countdown = _POLL_INTERVAL
+
+    def stats(self) -> dict:
+        """Counts of the work done so far."""
+        return {
+            "nodes": self.nodes,
+            "branches": self.branches,
+            "rows": self.rows,
+            "elapsed": time.monotonic() - self.started,
+        }
+
+    def charge(self, nodes: int = 0, branches: int = 0, rows: int = 0):
+        """Add work to the counts; raise ``BudgetExceeded`` if a limit has been passed."""
+        self.nodes += nodes
+        self.branches += branches
+        self.rows += rows
+        budget = self.budget
+        if budget.max_nodes is not None and self.nodes > budget.max_nodes:
+            raise BudgetExceeded("nodes", self.stats())
+        if budget.max_branches is not None and self.branches > budget.max_branches:
+            raise BudgetExceeded("branches", self.stats())
+        self._countdown -= 1
+        if not self._countdown:
+            self._countdown = _POLL_INTERVAL
+            self.poll()
+
+    def poll(self):
+        """Compare the clock and the memory with the budget."""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceeded("time", self.stats())
+        if self.budget.max_memory is not None and _resident_memory() > self.budget.max_memory:
+            raise BudgetExceeded("memory", self.stats())
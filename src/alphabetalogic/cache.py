@@ -0,0 +1,246 @@
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Callable, Optional, Tuple
+
+from .budget import Budget
+from .formula import Formula
+from .iterative_parser import tokenize
+from .parser import parse_formula
+from .results import UNKNOWN, CheckResult
+from .store import ResultStore
+from .tableaux import check_formula, check_if_tautology, check_with_table
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# a variable, but not the "r" of "or"
+_VARIABLE_RE = re.compile(r"\b[p-z](?:[1-9][0-9]*)?\b")
+
+
+def _canonical_name(index: int) -> str:
+    return f"p{index}" if index else "p"
+
+
+def _rename(names: dict, letter: str) -> str:
+    return _canonical_name(names.setdefault(letter, len(names)))
+
+
+def _token_key(text: str) -> Tuple[str, tuple]:
+    """
+    Tokens of the text with the variables renamed by first occurrence, spacing dropped,
+    and the original letters in the order of their canonical names.
+    """
+    names = {}
+    form = " ".join(_rename(names, token) if "p" <= token[0] <= "z" else token for token in tokenize(text))
+    return form, tuple(names)
+
+
+def _translate(result, names: dict):
+    """Rename the variables of the counterexample of a ``CheckResult``; other results pass through."""
+    if not isinstance(result, CheckResult) or result.counterexample is None:
+        return result
+    counterexample = {names[letter]: value for letter, value in result.counterexample.items()}
+    return CheckResult(result.verdict, counterexample, result.stats)
+
+
+def canonical_key(formula: Formula) -> str:
+    """
+    Serialize a parsed formula with the variables renamed by first occurrence.
+
+    The notation of the formula already has a single form for any spacing and any
+    parentheses the grammar allows around negations; renaming the variables to ``p``,
+    ``p1``, ``p2``, ... in the order they first occur makes the key equal for formulas
+    that differ only in naming.
+
+    Parameters
+    ----------
+    formula: Formula
+        The parsed formula.
+
+    Returns
+    -------
+    str
+        The canonical key.
+    """
+    names = {}
+    return _VARIABLE_RE.sub(lambda match: _rename(names, match.group()), formula.exp)
+
+
+class ResultCache:
+    """
+    LRU cache of check results keyed on the canonical form of the formula.
+
+    A text seen before finds its canonical key with one dictionary lookup. A new text
+    is reduced to its tokens with the variables renamed by first occurrence, a regex
+    pass, so texts that differ only in spacing or naming share that form. Only a new
+    token form is parsed, with the iterative parser, to find its canonical key, which
+    also merges the parentheses the grammar allows around negations, and only a new
+    key runs the check, or asks ``store`` first. The maps hold at most ``maxsize``
+    entries each and drop the least recently used ones. Unknown results, of checks that
+    ran out of their budget, are not stored. Counterexamples are kept in the canonical
+    variable names and given back in the names of the query.
+
+    Parameters
+    ----------
+    maxsize: int
+        Number of results kept.
+    store: ResultStore
+        Persistent store behind the cache: it is asked on a miss and receives every
+        new result.
+
+    Attributes
+    ----------
+    hits: int
+        Queries answered from the cache or from the store.
+    misses: int
+        Queries that ran a check.
+    store_hits: int
+        Queries, among the hits, answered from the store.
+    """
+
+    def __init__(self, maxsize: int = 4096, store: ResultStore = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self._texts = OrderedDict()
+        self._forms = OrderedDict()
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def info(self) -> CacheInfo:
+        """Return the counters and the size, like ``functools.lru_cache``."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._texts.clear()
+            self._forms.clear()
+            self._results.clear()
+            self.hits = self.misses = self.store_hits = 0
+
+    def check_if_tautology(self, formula: str, budget: Budget = None) -> Optional[bool]:
+        """Cached ``tableaux.check_if_tautology`` (without ``trace``)."""
+        return self.lookup("tableau", formula, lambda: check_if_tautology(formula, budget=budget))
+
+    def check_with_table(self, formula: str, engine: str = "rows") -> bool:
+        """Cached ``tableaux.check_with_table``; all engines share the results."""
+        return self.lookup("table", formula, lambda: check_with_table(formula, engine))
+
+    def check_formula(self, formula: str, engine: str = "tableau", budget: Budget = None) -> CheckResult:
+        """Cached ``tableaux.check_formula``; results of every engine are kept apart."""
+        return self.lookup(f"formula:{engine}", formula, lambda: check_formula(formula, engine, budget))
+
+    def lookup(self, namespace: str, formula: str, compute: Callable):
+        """
+        Return the cached result for the formula, or compute and store it.
+
+        Parameters
+        ----------
+        namespace: str
+            Kind of the check; results of different kinds are kept apart.
+        formula: str
+            The formula, as passed to the check.
+        compute: callable
+            Runs the check when the result is not cached.
+
+        Returns
+        -------
+        object
+            The result of the check.
+        """
+        entry = self._get(self._texts, formula)
+        if entry is None:
+            form, letters = _token_key(formula)
+            key = self._get(self._forms, form)
+            if key is None:
+                parsed = parse_formula(formula, backend="iterative")
+                if parsed is None:
+                    # not a formula: the check reports the error, nothing is cached
+                    return compute()
+                key = canonical_key(parsed)
+                self._remember(self._forms, form, key)
+            entry = key, letters
+            self._remember(self._texts, formula, entry)
+        key, letters = entry
+
+        result = self._get(self._results, (namespace, key))
+        if result is None and self.store is not None:
+            result = self.store.get(namespace, key)
+            if result is not None:
+                self._remember(self._results, (namespace, key), result)
+                with self._lock:
+                    self.store_hits += 1
+        if result is not None:
+            with self._lock:
+                self.hits += 1
+            return _translate(result, {_canonical_name(index): letter for index, letter in enumerate(letters)})
+
+        with self._lock:
+            self.misses += 1
+        result = compute()
+        if result is None or isinstance(result, CheckResult) and result.verdict == UNKNOWN:
+            return result
+        canonical = _translate(result, {letter: _canonical_name(index) for index, letter in enumerate(letters)})
+        self._remember(self._results, (namespace, key), canonical)
+        if self.store is not None:
+            self.store.put(namespace, key, canonical)
+        return result
+
+    def _get(self, entries: OrderedDict, key):
+        with self._lock:
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+            return value
+
+    def _remember(self, entries: OrderedDict, key, value):
+        with self._lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+
+_default_cache = None
+
+
+def get_default_cache() -> ResultCache:
+    """
+    Return the cache used by the ``cached_*`` functions.
+
+    If the ``ALPHABETALOGIC_RESULT_STORE`` environment variable names a file, the
+    cache is backed by a ``ResultStore`` in it.
+    """
+    global _default_cache
+    if _default_cache is None:
+        path = os.environ.get("ALPHABETALOGIC_RESULT_STORE")
+        _default_cache = ResultCache(store=ResultStore(path) if path else None)
+    return _default_cache
+
+
+def set_default_cache(cache: ResultCache):
+    """Replace the cache used by the ``cached_*`` functions, for example by one with a store."""
+    global _default_cache
+    _default_cache = cache
+
+
+def cached_check_if_tautology(formula: str, budget: Budget = None) -> Optional[bool]:
+    """``check_if_tautology`` through the default cache."""
+    return get_default_cache().check_if_tautology(formula, budget)
+
+
+def cached_check_with_table(formula: str, engine: str = "rows") -> bool:
+    """``check_with_table`` through the default cache."""
+    return get_default_cache().check_with_table(formula, engine)
+
+
+def cached_check_formula(formula: str, engine: str = "tableau", budget: Budget = None) -> CheckResult:
+    """``check_formula`` through the default cache."""
+    return get_default_cache().check_formula(formula, engine, budget)
@@ -0,0 +1,183 @@
+from functools import lru_cache
+
+from .dag import (
+    CONJUNCTION,
+    DISJUNCTION,
+    EQUALITY,
+    IMPLICATION,
+    NEGATION,
+    VARIABLE,
+    FormulaTable,
+)
+from .formula import Formula
+
+# opcodes of the register program
+NOT = 0
+AND = 1
+OR = 2
+IMPLIES = 3
+EQUIVALENT = 4
+
+_OPCODES = {
+    CONJUNCTION: AND,
+    DISJUNCTION: OR,
+    IMPLICATION: IMPLIES,
+    EQUALITY: EQUIVALENT,
+}
+
+# ``mask`` has every evaluated bit set: 1 for single rows, all ones for bit-sliced words
+_EXPRESSIONS = {
+    NOT: "r{a} ^ mask",
+    AND: "r{a} & r{b}",
+    OR: "r{a} | r{b}",
+    IMPLIES: "(r{a} ^ mask) | r{b}",
+    EQUIVALENT: "r{a} ^ r{b} ^ mask",
+}
+
+
+class CompiledFormula:
+    """
+    Formula compiled to a flat register program over dense variable indices.
+
+    Registers ``0 .. len(variables) - 1`` hold the variable values. Every instruction
+    is an ``(opcode, a, b)`` triple, stored flat in ``program``, that writes the next
+    register from registers ``a`` and ``b``; the last register is the value of the
+    formula. The program is turned into a straight-line Python function, so evaluating
+    a row involves no method dispatch and no dictionary lookups.
+
+    Compiled formulas are immutable, hashable and picklable: only the variables and the
+    program are pickled and the function is regenerated (once per process) on load.
+
+    Attributes
+    ----------
+    variables: tuple
+        Variable letters, sorted; position is the variable index.
+    program: tuple
+        Flattened ``(opcode, a, b)`` instructions.
+    """
+
+    __slots__ = ("variables", "program", "_function")
+
+    def __init__(self, variables: tuple, program: tuple):
+        self.variables = tuple(variables)
+        self.program = tuple(program)
+        self._function = _build_function(len(self.variables), self.program)
+
+    def __call__(self, values, mask=1):
+        """
+        Evaluate the formula.
+
+        Parameters
+        ----------
+        values: sequence
+            Value of every variable, by index: 0/1 for a single row, or integer/NumPy
+            words of bit-sliced rows.
+        mask: int
+            Value with all evaluated bits set.
+
+        Returns
+        -------
+        int
+            Value of the formula, in the same representation as the inputs.
+        """
+        return self._function(values, mask)
+
+    def evaluate(self, variables_dict: dict) -> int:
+        """Evaluate the formula for values given by variable letter."""
+        return self._function([variables_dict[letter] for letter in self.variables], 1)
+
+    def __reduce__(self):
+        return CompiledFormula, (self.variables, self.program)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, CompiledFormula)
+            and self.variables == other.variables
+            and self.program == other.program
+        )
+
+    def __hash__(self):
+        return hash((self.variables, self.program))
+
+    def __len__(self):
+        return len(self.program) // 3
+
+
+@lru_cache(maxsize=256)
+def _build_function(variable_count: int, program: tuple):
+    registers = [f"r{index}" for index in range(variable_count)]
+    lines = ["def evaluate(values, mask):", f"    {', '.join(registers)}, = values"]
+    register = variable_count
+    for position in range(0, len(program), 3):
+        opcode, a, b = program[position : position + 3]
+        lines.append(f"    r{register} = " + _EXPRESSIONS[opcode].format(a=a, b=b))
+        register += 1
+    lines.append(f"    return r{register - 1}")
+    namespace = {}
+    exec(compile("\n".join(lines), "<compiled formula>", "exec"), namespace)
+    return namespace["evaluate"]
+
+
+def compile_formula(formula: Formula) -> CompiledFormula:
+    """
+    Compile a formula to a register program.
+
+    Subformulas are interned first, so every distinct subformula is computed once.
+    Polarity flags set on the nodes (``negation``) are honoured.
+
+    Parameters
+    ----------
+    formula: Formula
+        The formula to compile.
+
+    Returns
+    -------
+    CompiledFormula
+        The compiled formula.
+    """
+    root = FormulaTable().intern(formula)
+
+    # post-order of the distinct nodes, without recursion
+    order = []
+    visited = set()
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if node.id in visited:
+            continue
+        visited.add(node.id)
+        stack.append((node, True))
+        stack.extend((argument, False) for argument in reversed(node.arguments))
+
+    variables = sorted({node.letter for node in order if node.kind == VARIABLE})
+    indices = {letter: index for index, letter in enumerate(variables)}
+    program = []
+    registers = {}
+    next_register = len(variables)
+
+    def emit(opcode, a, b=0):
+        nonlocal next_register
+        program.extend((opcode, a, b))
+        next_register += 1
+        return next_register - 1
+
+    for node in order:
+        if node.kind == VARIABLE:
+            register = indices[node.letter]
+        elif node.kind == NEGATION:
+            register = emit(NOT, registers[node.arguments[0].id])
+        else:
+            left, right = node.arguments
+            register = emit(_OPCODES[node.kind], registers[left.id], registers[right.id])
+        if node.negation:
+            register = emit(NOT, register)
+        registers[node.id] = register
+
+    # the result must be in the last register
+    result = registers[root.id]
+    if result != next_register - 1:
+        emit(OR, result, result)
+    return CompiledFormula(variables, program)
@@ -0,0 +1,227 @@
+from .formula import (
+    CONJUNCTION_PREFIX,
+    DISJUNCTION_PREFIX,
+    EQUALITY_PREFIX,
+    IMPLICATION_PREFIX,
+    NEGATION_PREFIX,
+    Conjunction,
+    Disjunction,
+    Equality,
+    Formula,
+    Implication,
+    Negation,
+    Variable,
+)
+
+VARIABLE = "Variable"
+CONJUNCTION = "Conjunction"
+DISJUNCTION = "Disjunction"
+IMPLICATION = "Implication"
+EQUALITY = "Equality"
+NEGATION = "Negation"
+
+PREFIXES = {
+    CONJUNCTION: CONJUNCTION_PREFIX,
+    DISJUNCTION: DISJUNCTION_PREFIX,
+    IMPLICATION: IMPLICATION_PREFIX,
+    EQUALITY: EQUALITY_PREFIX,
+    NEGATION: NEGATION_PREFIX,
+}
+
+_FORMULA_CLASSES = {
+    CONJUNCTION: Conjunction,
+    DISJUNCTION: Disjunction,
+    IMPLICATION: Implication,
+    EQUALITY: Equality,
+    NEGATION: Negation,
+}
+
+
+class Node:
+    """
+    Immutable formula node shared by all structurally equal formulas of a ``FormulaTable``.
+
+    Nodes are interned, so equality is identity and the hash is computed once, when
+    the node is created.
+
+    Attributes
+    ----------
+    kind: str
+        Name of the matching ``Formula`` class.
+    letter: str
+        Letter of a variable, None for operators.
+    arguments: tuple
+        Argument nodes of an operator, empty for variables.
+    negation: bool
+        Polarity of the node, like ``Formula.negation``.
+    id: int
+        Dense index of the node in its table.
+    """
+
+    __slots__ = ("kind", "letter", "arguments", "negation", "id", "_hash", "_exp", "__weakref__")
+
+    def __init__(self, kind, letter, arguments, negation, index, hash_value):
+        set_attribute = object.__setattr__
+        set_attribute(self, "kind", kind)
+        set_attribute(self, "letter", letter)
+        set_attribute(self, "arguments", arguments)
+        set_attribute(self, "negation", negation)
+        set_attribute(self, "id", index)
+        set_attribute(self, "_hash", hash_value)
+        set_attribute(self, "_exp", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Formula nodes are immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"<{self.kind} {self.exp}>"
+
+    @property
+    def exp(self) -> str:
+        """Prefix notation of the node, with ``~`` in front of every negated node."""
+        if self._exp is None:
+            parts = []
+            stack = [self]
+            while stack:
+                item = stack.pop()
+                if isinstance(item, str):
+                    parts.append(item)
+                    continue
+                if item.negation:
+                    parts.append(NEGATION_PREFIX)
+                if item.kind == VARIABLE:
+                    parts.append(item.letter)
+                elif item.kind == NEGATION:
+                    parts.append(NEGATION_PREFIX)
+                    stack.append(item.arguments[0])
+                else:
+                    parts.append("(")
+                    stack.extend((")", item.arguments[1], f" {PREFIXES[item.kind]} ", item.arguments[0]))
+            object.__setattr__(self, "_exp", "".join(parts))
+        return self._exp
+
+
+class FormulaTable:
+    """
+    Unique table of interned formula nodes.
+
+    Every node is created through the table, which returns the existing node when a
+    structurally equal one, including polarity, has already been built. The table owns
+    its nodes: they are released together with it.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+        self._by_id = []
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def node(self, index: int) -> Node:
+        """Return the node with the given id."""
+        return self._by_id[index]
+
+    def _node(self, kind, letter, arguments, negation) -> Node:
+        key = (kind, letter, tuple(argument.id for argument in arguments), negation)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(kind, letter, arguments, negation, len(self._nodes), hash(key))
+            self._nodes[key] = node
+            self._by_id.append(node)
+        return node
+
+    def variable(self, letter: str, negation: bool = False) -> Node:
+        return self._node(VARIABLE, letter, (), negation)
+
+    def conjunction(self, left: Node, right: Node, negation: bool = False) -> Node:
+        return self._node(CONJUNCTION, None, (left, right), negation)
+
+    def disjunction(self, left: Node, right: Node, negation: bool = False) -> Node:
+        return self._node(DISJUNCTION, None, (left, right), negation)
+
+    def implication(self, left: Node, right: Node, negation: bool = False) -> Node:
+        return self._node(IMPLICATION, None, (left, right), negation)
+
+    def equality(self, left: Node, right: Node, negation: bool = False) -> Node:
+        return self._node(EQUALITY, None, (left, right), negation)
+
+    def negation(self, argument: Node, negation: bool = False) -> Node:
+        return self._node(NEGATION, None, (argument,), negation)
+
+    def operator(self, kind: str, arguments: tuple, negation: bool = False) -> Node:
+        """Build an operator node of the given kind."""
+        return self._node(kind, None, tuple(arguments), negation)
+
+    def complement(self, node: Node) -> Node:
+        """Return the node with the opposite polarity."""
+        return self._node(node.kind, node.letter, node.arguments, not node.negation)
+
+    def intern(self, formula: Formula) -> Node:
+        """
+        Convert a ``Formula`` tree into interned nodes.
+
+        The conversion uses an explicit stack, so it works for arbitrarily deep formulas.
+
+        Parameters
+        ----------
+        formula: Formula
+            Formula to convert.
+
+        Returns
+        -------
+        Node
+            Node of the root of the formula.
+        """
+        interned = {}
+        stack = [formula]
+        while stack:
+            item = stack[-1]
+            if id(item) in interned:
+                stack.pop()
+                continue
+            if isinstance(item, Variable):
+                interned[id(item)] = self.variable(item.letter, item.negation)
+                stack.pop()
+                continue
+            pending = [argument for argument in item.arguments if id(argument) not in interned]
+            if pending:
+                stack.extend(reversed(pending))
+                continue
+            stack.pop()
+            arguments = tuple(interned[id(argument)] for argument in item.arguments)
+            interned[id(item)] = self.operator(type(item).__name__, arguments, item.negation)
+        return interned[id(formula)]
+
+    def to_formula(self, node: Node) -> Formula:
+        """
+        Build a fresh ``Formula`` tree from a node.
+
+        Shared nodes become separate formula objects, as the parser would build them.
+
+        Parameters
+        ----------
+        node: Node
+            Node to convert.
+
+        Returns
+        -------
+        Formula
+            A new formula object tree.
+        """
+        root = [None]
+        stack = [(node, root, 0)]
+        while stack:
+            item, target, index = stack.pop()
+            if item.kind == VARIABLE:
+                formula = Variable(letter=item.letter)
+            else:
+                arguments = [None] * len(item.arguments)
+                formula = _FORMULA_CLASSES[item.kind](arguments=arguments)
+                stack.extend((argument, arguments, position) for position, argument in enumerate(item.arguments))
+            formula.negation = item.negation
+            formula.is_self_standing = target is root
+            target[index] = formula
+        return root[0]
@@ -1,38 +1,141 @@
 import copy
+import sys
 
 from ply import lex, yacc
 
 from .utils import Vertex
 
 
+_SLOTS = {}
+_MISSING = object()
+
+
+def _slots(cls) -> tuple:
+    """Names of the slots of a formula class and its bases."""
+    names = _SLOTS.get(cls)
+    if names is None:
+        names = tuple(
+            name
+            for klass in cls.__mro__
+            for name in klass.__dict__.get("__slots__", ())
+            if name != "__weakref__"
+        )
+        _SLOTS[cls] = names
+    return names
+
+
 class Formula:
-    registry = set()
+    """
+    Base of the formula classes.
+
+    Formulas use ``__slots__``: a large tableau holds a copy of a formula in every
+    node, so nodes carry no attribute dictionary, and presentation data such as colors
+    is kept by the tree in side tables.
+    """
+
+    __slots__ = ("is_self_standing", "negation", "_exp", "__weakref__")
     counter = 0
 
     def __init__(self, is_self_standing=True):
         self.is_self_standing = is_self_standing
-        Formula.registry.add(self)
         self.negation = False
+        self._exp = None
+
+    @property
+    def exp(self):
+        """Prefix notation of the formula, computed on first access."""
+        if self._exp is None:
+            self.to_prefix_notation()
+        return self._exp
+
+    @exp.setter
+    def exp(self, value):
+        self._exp = value
+
+    def __copy__(self):
+        clone = object.__new__(type(self))
+        for name in _slots(type(self)):
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                setattr(clone, name, value)
+        return clone
 
     def get_value(self):
         pass
 
-    @staticmethod
-    def set_values(variables_dict):
-        for f in Formula.registry:
-            if isinstance(f, Variable):
-                f.set_value(variables_dict[f.letter])
+    def variable_table(self) -> dict:
+        """
+        Collect the variables of this formula.
+
+        The formula owns its variables: nothing outside the formula is visited and
+        nothing is kept after the formula is released.
+
+        Returns
+        -------
+        dict
+            Variable objects of the formula grouped by letter, in order of first occurrence.
+        """
+        table = {}
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, Variable):
+                table.setdefault(item.letter, []).append(item)
+            else:
+                stack.extend(reversed(item.arguments))
+        return table
+
+    def index_variables(self) -> dict:
+        """
+        Give every variable of the formula a dense integer id, ``Variable.index``.
+
+        Ids follow the sorted letters, like the registers of a compiled formula, so
+        literals can be kept in bitsets instead of sets of strings.
+
+        Returns
+        -------
+        dict
+            Id of every letter.
+        """
+        table = self.variable_table()
+        ids = {letter: index for index, letter in enumerate(sorted(table))}
+        for letter, variables in table.items():
+            for variable in variables:
+                variable.index = ids[letter]
+        return ids
+
+    def set_values(self, variables_dict):
+        """Assign values to the variables of this formula only."""
+        for letter, variables in self.variable_table().items():
+            value = variables_dict[letter]
+            for variable in variables:
+                variable.set_value(value)
 
     def to_prefix_notation(self):
         pass
 
+    def compile(self):
+        """
+        Compile the formula for fast repeated evaluation.
+
+        Returns
+        -------
+        CompiledFormula
+            Picklable register program over the sorted variables of the formula.
+        """
+        from .compiler import compile_formula
+
+        return compile_formula(self)
+
 
 class Variable(Formula):
+    __slots__ = ("letter", "index", "value")
+
     def __init__(self, letter: str):
         super().__init__()
         self.letter = letter
-        self.exp = letter
-        self.color = "#2596be"
+        self.index = None
+        self._exp = letter
 
     def get_value(self):
         return self.value
@@ -42,7 +145,8 @@ class Variable(Formula):
 
     def to_prefix_notation(self):
         prefix = "~" if self.negation else ""
-        self.exp = prefix + self.letter
+        # literals repeat in every branch, so their notation is shared
+        self.exp = sys.intern(prefix + self.letter)
         return self.exp
 
     def negate(self):
@@ -62,23 +166,59 @@ IMPLICATION_PREFIX = "=>"
 
 
 class Operator(Formula):
+    __slots__ = ("prefix", "arguments")
+
     def __init__(self, prefix: str, arguments: list):
         super().__init__()
         self.prefix = prefix
         self.arguments = arguments
-        self.exp = None
-        self.color = "#2596be"
 
     def to_prefix_notation(self):
-        prefixed_arguments = list()
-        for argument in self.arguments:
-            if isinstance(argument, Variable):
-                prefixed_arguments.append(argument.letter)
+        """
+        Build the notation of the formula with an explicit stack instead of recursion.
+
+        Nested operators get their own notation lazily, through ``exp``.
+        """
+        parts = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            elif isinstance(item, Variable):
+                parts.append(item.letter)
+            elif isinstance(item, Negation):
+                parts.append(item.prefix)
+                stack.append(item.arguments[0])
             else:
-                prefixed_arguments.append(argument.to_prefix_notation())
-        self.exp = f"({prefixed_arguments[0]} {self.prefix} {prefixed_arguments[1]})"
+                parts.append("(")
+                stack.extend((")", item.arguments[1], f" {item.prefix} ", item.arguments[0]))
+        self.exp = "".join(parts)
         return self.exp
 
+    def get_value(self):
+        """
+        Evaluate the formula for the values set on its variables.
+
+        The subformulas are evaluated in post-order from an explicit stack.
+        """
+        values = {}
+        stack = [(self, False)]
+        while stack:
+            item, expanded = stack.pop()
+            if isinstance(item, Variable):
+                values[id(item)] = item.get_value()
+            elif expanded:
+                values[id(item)] = item.combine(*(values[id(argument)] for argument in item.arguments))
+            else:
+                stack.append((item, True))
+                stack.extend((argument, False) for argument in item.arguments)
+        return values[id(self)]
+
+    def combine(self, *values):
+        """Value of the operator for the given values of its arguments."""
+        raise NotImplementedError
+
     def negate(self):
         """Neguje wyrazenie."""
         self.negation = not self.negation
@@ -89,52 +229,53 @@ class Operator(Formula):
 
 
 class Conjunction(Operator):
+    __slots__ = ()
+
     def __init__(self, arguments):
         super().__init__(CONJUNCTION_PREFIX, arguments)
 
-    def get_value(self):
-        return self.arguments[0].get_value() and self.arguments[1].get_value()
+    def combine(self, left, right):
+        return left and right
 
 
 class Disjunction(Operator):
+    __slots__ = ()
+
     def __init__(self, arguments):
         super().__init__(DISJUNCTION_PREFIX, arguments)
 
-    def get_value(self):
-        return self.arguments[0].get_value() or self.arguments[1].get_value()
+    def combine(self, left, right):
+        return left or right
 
 
 class Implication(Operator):
+    __slots__ = ()
+
     def __init__(self, arguments):
         super().__init__(IMPLICATION_PREFIX, arguments)
 
-    def get_value(self):
-        if self.arguments[0].get_value() == 0 or self.arguments[1].get_value() == 1:
+    def combine(self, left, right):
+        if left == 0 or right == 1:
             return 1
         else:
             return 0
 
 
 class Equality(Operator):
+    __slots__ = ()
+
     def __init__(self, arguments):
         super().__init__(EQUALITY_PREFIX, arguments)
 
-    def get_value(self):
-        return int(self.arguments[0].get_value() == self.arguments[1].get_value())
+    def combine(self, left, right):
+        return int(left == right)
 
 
 class Negation(Operator):
+    __slots__ = ()
+
     def __init__(self, arguments):
         super().__init__(NEGATION_PREFIX, arguments)
 
-    def get_value(self):
-        return int(not (self.arguments[0].get_value()))
-
-    def to_prefix_notation(self):
-        if isinstance(self.arguments[0], Variable):
-            prefixed_argument = self.arguments[0].letter
-        else:
-            prefixed_argument = self.arguments[0].to_prefix_notation()
-
-        self.exp = f"{self.prefix}{prefixed_argument}"
-        return self.exp
+    def combine(self, argument):
+        return int(not argument)
@@ -0,0 +1,180 @@
+import re
+
+from .formula import (
+    Conjunction,
+    Disjunction,
+    Equality,
+    Formula,
+    Implication,
+    Negation,
+    Variable,
+)
+
+# Same token rules, in the same order, as the PLY lexer in parser.py, followed by a
+# catch-all for unknown characters; ignored whitespace is never matched.
+_TOKEN_RE = re.compile(
+    r"\(|\)|[p-z](?:[1-9][0-9]*)?|and|=>|<=>|~|or|[^ \t\r\n\f\v]",
+    re.UNICODE | re.DOTALL,
+)
+_KNOWN_TOKENS = frozenset(["(", ")", "~", "and", "or", "=>", "<=>"] + [chr(c) for c in range(ord("p"), ord("z") + 1)])
+
+# Tokens joined with single spaces keep them only around binary operators.
+_SPACING_RE = re.compile(r"(?<=[(~]) | (?=\))")
+
+_BINARY_OPERATORS = {
+    "and": Conjunction,
+    "or": Disjunction,
+    "=>": Implication,
+    "<=>": Equality,
+}
+
+# parse stack marker of a pending negation; open parentheses are pushed as their token position
+_NEGATION = None
+
+
+class ParseError(Exception):
+    def __init__(self, position: int):
+        super().__init__(f"Syntax error at token {position}")
+        self.position = position
+
+
+def tokenize(text: str) -> list:
+    """
+    Split the text into tokens in a single regex pass.
+
+    Unknown characters are reported and skipped, like in the PLY lexer.
+
+    Parameters
+    ----------
+    text: str
+        Logical expression in infix notation.
+
+    Returns
+    -------
+    list
+        List of token strings.
+    """
+    tokens = _TOKEN_RE.findall(text)
+    for token in _KNOWN_TOKENS.symmetric_difference(tokens):
+        # anything outside the known set is either an unused known token or a longer variable
+        if token not in _KNOWN_TOKENS and not "p" <= token[0] <= "z":
+            return _drop_unknown(tokens)
+    return tokens
+
+
+def _drop_unknown(tokens: list) -> list:
+    known = []
+    for token in tokens:
+        if token in _KNOWN_TOKENS or "p" <= token[0] <= "z":
+            known.append(token)
+        else:
+            print('Unknown character "{}"'.format(token))
+    return known
+
+
+def _parse_tokens(tokens: list, position: int) -> Formula:
+    """
+    Build the formula from tokens, starting at the given position, with an explicit stack.
+
+    The stack holds negation markers, positions of open parentheses and
+    ``(left, operator_class)`` pairs of binary operators waiting for their right
+    argument, so nesting depth is limited only by memory. The prefix notation of the
+    result is assembled from the tokens on the way, without walking the formula.
+    """
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    start = position
+    # the sentinel stands for the end of input
+    tokens = tokens + [None]
+    # parentheses of negation_with_parens do not appear in the prefix notation
+    dropped = []
+
+    while True:
+        # shift prefixes until an atom completes a formula
+        while True:
+            token = tokens[position]
+            position += 1
+            if token == "(":
+                push(position - 1)
+            elif token == "~":
+                push(_NEGATION)
+            elif token is None or token == ")" or token in _BINARY_OPERATORS:
+                raise ParseError(position - 1)
+            else:
+                formula = Variable(letter=token)
+                break
+
+        # reduce as far as the lookahead allows
+        while stack:
+            lookahead = tokens[position]
+            top = stack[-1]
+            if type(top) is tuple:
+                if lookahead != ")":
+                    raise ParseError(position)
+                pop()
+                position += 1
+                left, operator_class = top
+                left.is_self_standing = False
+                formula.is_self_standing = False
+                formula = operator_class(arguments=[left, formula])
+            elif top is _NEGATION:
+                pop()
+                formula.is_self_standing = False
+                formula = Negation(arguments=[formula])
+                # negation_with_parens : LPAREN NEGATION formula RPAREN
+                if lookahead == ")" and stack and type(stack[-1]) is int:
+                    dropped.append(pop())
+                    dropped.append(position)
+                    position += 1
+            else:
+                operator_class = _BINARY_OPERATORS.get(lookahead)
+                if operator_class is None:
+                    raise ParseError(position)
+                stack[-1] = (formula, operator_class)
+                position += 1
+                break
+        else:
+            if tokens[position] is not None:
+                raise ParseError(position)
+            parts = tokens[start:-1]
+            for index in dropped:
+                parts[index - start] = ""
+            formula.exp = _SPACING_RE.sub("", " ".join(filter(None, parts)))
+            return formula
+
+
+def parse_iterative(text: str) -> Formula:
+    """
+    Parse a logical expression without PLY and without recursion.
+
+    Accepts exactly the grammar of the PLY parser in ``parser.py`` and builds the
+    same ``Formula`` objects, with the prefix notation of the root already set.
+    Syntax errors are recovered from the way PLY does it without error rules: the
+    message is printed (unless fewer than three tokens were shifted since the
+    previous error), the partial parse and the offending token are discarded and
+    parsing restarts; an error at the end of input returns None.
+
+    Parameters
+    ----------
+    text: str
+        Logical expression in infix notation.
+
+    Returns
+    -------
+    Formula
+        The parsed formula or None.
+    """
+    tokens = tokenize(text)
+    start = 0
+    first_error = True
+    while True:
+        try:
+            return _parse_tokens(tokens, start)
+        except ParseError as error:
+            if first_error or error.position - start >= 3:
+                print("Syntax error in input!")
+            first_error = False
+            if error.position >= len(tokens):
+                return None
+            start = error.position + 1
@@ -0,0 +1,156 @@
+from typing import Union
+
+from .dag import CONJUNCTION, DISJUNCTION, EQUALITY, IMPLICATION, NEGATION, VARIABLE, FormulaTable, Node
+from .formula import Formula
+from .parity import linear_equalities
+
+# components of a signed formula by (kind, value): the signs of the (left, right) arguments
+# in every branch; one branch is a non-branching (alpha) rule, two a branching (beta) one
+_RULES = {
+    (CONJUNCTION, True): (((0, True), (1, True)),),
+    (CONJUNCTION, False): (((0, False),), ((1, False),)),
+    (DISJUNCTION, True): (((0, True),), ((1, True),)),
+    (DISJUNCTION, False): (((0, False), (1, False)),),
+    (IMPLICATION, True): (((0, False),), ((1, True),)),
+    (IMPLICATION, False): (((0, True), (1, False)),),
+    (EQUALITY, True): (((0, True), (1, True)), ((0, False), (1, False))),
+    (EQUALITY, False): (((0, True), (1, False)), ((0, False), (1, True))),
+}
+
+
+def to_nnf(table: FormulaTable, node: Node, sign: bool = True, memo: dict = None, atoms: set = None) -> Node:
+    """
+    Rewrite a signed node of the table in negation normal form.
+
+    The result is built from conjunctions, disjunctions and literals only, with
+    negation only on variables: every rule of ``_RULES`` becomes the disjunction of its
+    branches, each the conjunction of its components. Results are interned in the same
+    table and remembered per (node, sign), so a formula shared in the DAG, or needed
+    with both signs, as the arguments of an equality are, is rewritten once. The
+    rewriting uses an explicit stack. Equalities listed in ``atoms`` are kept whole, as
+    literals are, with the sign as their polarity.
+
+    Parameters
+    ----------
+    table: FormulaTable
+        Table of the node; it receives the new nodes.
+    node: Node
+        The node to rewrite.
+    sign: bool
+        True for the node itself, False for its negation.
+    memo: dict
+        Results by (node id, sign), shared between calls on the same table.
+    atoms: set
+        Ids of equalities that are not rewritten, see ``parity.linear_equalities``.
+
+    Returns
+    -------
+    Node
+        Node of the normal form.
+    """
+    memo = {} if memo is None else memo
+    stack = [(node, sign)]
+    while stack:
+        item, item_sign = stack[-1]
+        if (item.id, item_sign) in memo:
+            stack.pop()
+            continue
+        value = item_sign != item.negation
+        kind = item.kind
+        if kind == VARIABLE:
+            memo[item.id, item_sign] = table.variable(item.letter, not value)
+            stack.pop()
+            continue
+        if atoms is not None and item.id in atoms:
+            memo[item.id, item_sign] = item if item_sign else table.complement(item)
+            stack.pop()
+            continue
+        if kind == NEGATION:
+            components = [(item.arguments[0], not value)]
+        else:
+            components = [
+                (item.arguments[index], component_sign)
+                for branch in _RULES[kind, value]
+                for index, component_sign in branch
+            ]
+        pending = [(argument, argument_sign) for argument, argument_sign in components
+                   if (argument.id, argument_sign) not in memo]
+        if pending:
+            stack.extend(reversed(pending))
+            continue
+        stack.pop()
+        if kind == NEGATION:
+            memo[item.id, item_sign] = memo[components[0][0].id, components[0][1]]
+            continue
+        branches = []
+        for branch in _RULES[kind, value]:
+            conjuncts = [memo[item.arguments[index].id, component_sign] for index, component_sign in branch]
+            branches.append(conjuncts[0] if len(conjuncts) == 1 else table.conjunction(*conjuncts))
+        memo[item.id, item_sign] = branches[0] if len(branches) == 1 else table.disjunction(*branches)
+    return memo[node.id, sign]
+
+
+class NormalForm:
+    """
+    A formula interned once, with its negation normal forms built on demand.
+
+    The normal form is immutable and owns its table, so it can be checked any number of
+    times, for example with ``tableau_closes(normal)`` and
+    ``tableau_closes(normal.negation())``, without parsing or rewriting it again.
+
+    With ``parity`` the equalities built only from variables, negations and equalities
+    (``parity.linear_equalities``) are not rewritten: such a chain has normal forms
+    exponential in its length, while the tableau decides it as a single parity
+    constraint.
+
+    Parameters
+    ----------
+    formula: Formula
+        The parsed formula.
+    table: FormulaTable
+        Table to intern the formula in; a new one if not given.
+    parity: bool
+        Keep the linear equalities whole.
+
+    Attributes
+    ----------
+    table: FormulaTable
+        Table of the interned formula and of its normal forms.
+    source: Node
+        The interned formula, as parsed.
+    sign: bool
+        False for the normal form of the negation of ``source``.
+    parity: bool
+        Whether the linear equalities are kept whole.
+    """
+
+    __slots__ = ("table", "source", "sign", "parity", "_memo", "_atoms")
+
+    def __init__(
+        self,
+        formula: Union[Formula, Node],
+        table: FormulaTable = None,
+        sign: bool = True,
+        memo=None,
+        parity: bool = False,
+    ):
+        self.table = table if table is not None else FormulaTable()
+        self.source = formula if isinstance(formula, Node) else self.table.intern(formula)
+        self.sign = sign
+        self.parity = parity
+        self._memo = {} if memo is None else memo
+        self._atoms = linear_equalities(self.source) if parity else None
+
+    @property
+    def root(self) -> Node:
+        """Node of the normal form, built on first access."""
+        return to_nnf(self.table, self.source, self.sign, self._memo, self._atoms)
+
+    def negation(self) -> "NormalForm":
+        """The normal form of the negation, sharing the table and the rewritten nodes."""
+        return NormalForm(self.source, self.table, not self.sign, self._memo, self.parity)
+
+    @property
+    def exp(self) -> str:
+        """Notation of the normal form."""
+        return self.root.exp
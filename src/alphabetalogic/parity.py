@@ -0,0 +1,150 @@
+from typing import Dict, Set, Tuple
+
+from .dag import EQUALITY, NEGATION, VARIABLE, Node
+
+
+def linear_equalities(root: Node) -> Set[int]:
+    """
+    Find the equalities of a formula that are parity constraints.
+
+    A node is linear if it is a variable, or a negation or an equality of linear nodes:
+    over GF(2) ``A <=> B`` is ``1 + A + B`` and ``~A`` is ``1 + A``, so such a node is
+    true exactly when an odd or even number of its variables are, whatever its shape.
+
+    Parameters
+    ----------
+    root: Node
+        The interned formula.
+
+    Returns
+    -------
+    set
+        Ids of the linear nodes of kind ``EQUALITY`` below ``root``.
+    """
+    linear = {}
+    equalities = set()
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        if node.id in linear:
+            stack.pop()
+            continue
+        pending = [argument for argument in node.arguments if argument.id not in linear]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        linear[node.id] = node.kind == VARIABLE or (
+            node.kind in (NEGATION, EQUALITY) and all(linear[argument.id] for argument in node.arguments)
+        )
+        if linear[node.id] and node.kind == EQUALITY:
+            equalities.add(node.id)
+    return equalities
+
+
+def parity_row(node: Node, ids: Dict[str, int], memo: Dict[int, Tuple[int, int]] = None) -> Tuple[int, int]:
+    """
+    Affine form over GF(2) of a linear node.
+
+    Parameters
+    ----------
+    node: Node
+        A linear node, see ``linear_equalities``.
+    ids: dict
+        Bit of every letter; new letters get the next free bit.
+    memo: dict
+        Forms by node id, shared between calls with the same ``ids``.
+
+    Returns
+    -------
+    tuple
+        ``(mask, constant)``: the node is true exactly when ``constant`` plus the number
+        of true variables whose bits are set in ``mask`` is odd.
+    """
+    memo = {} if memo is None else memo
+    stack = [node]
+    while stack:
+        item = stack[-1]
+        if item.id in memo:
+            stack.pop()
+            continue
+        pending = [argument for argument in item.arguments if argument.id not in memo]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        if item.kind == VARIABLE:
+            mask, constant = 1 << ids.setdefault(item.letter, len(ids)), 0
+        elif item.kind == NEGATION:
+            mask, constant = memo[item.arguments[0].id]
+            constant ^= 1
+        else:
+            (left, left_constant), (right, right_constant) = (memo[argument.id] for argument in item.arguments)
+            mask, constant = left ^ right, 1 ^ left_constant ^ right_constant
+        memo[item.id] = mask, constant ^ item.negation
+    return memo[node.id]
+
+
+class ParitySystem:
+    """
+    System of linear equations over GF(2) kept in echelon form.
+
+    An equation is a bitmask of variables and the parity their sum must have. Every row
+    is stored under its pivot, the lowest bit of its mask, and no two rows share a pivot,
+    so a new equation is reduced, by Gaussian elimination, in at most one step per row
+    and the system is consistent as long as no equation reduces to ``0 = 1``.
+
+    Parameters
+    ----------
+    rows: dict
+        Rows by pivot, taken over, not copied.
+    """
+
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: Dict[int, Tuple[int, int]] = None):
+        self.rows = {} if rows is None else rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def copy(self) -> "ParitySystem":
+        """A system with the same rows that can be extended independently."""
+        return ParitySystem(dict(self.rows))
+
+    def add(self, mask: int, parity: int) -> bool:
+        """
+        Add the equation that the variables of ``mask`` sum to ``parity``.
+
+        Returns
+        -------
+        bool
+            False if the system has become inconsistent; it is unchanged then.
+        """
+        rows = self.rows
+        while mask:
+            pivot = mask & -mask
+            row = rows.get(pivot)
+            if row is None:
+                rows[pivot] = mask, parity
+                return True
+            mask ^= row[0]
+            parity ^= row[1]
+        return not parity
+
+    def solution(self) -> int:
+        """
+        Solve the system by back substitution, with the free variables false.
+
+        Returns
+        -------
+        int
+            Bitmask of the variables that are true.
+        """
+        ones = 0
+        # every other bit of a row is above its pivot, so higher pivots are solved first
+        for pivot in sorted(self.rows, reverse=True):
+            mask, parity = self.rows[pivot]
+            if parity ^ (bin(mask & ones).count("1") & 1):
+                ones |= pivot
+        return ones
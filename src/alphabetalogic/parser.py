@@ -1,4 +1,8 @@
+import copy
+import os
 import re
+import sys
+import threading
 
 from ply import lex, yacc
 
@@ -11,6 +15,7 @@ from .formula import (
     Negation,
     Variable,
 )
+from .iterative_parser import parse_iterative
 
 tokens = [
     "LPAREN",
@@ -161,9 +166,103 @@ def __is_error(obj) -> bool:
     return isinstance(obj, yacc.YaccSymbol) and obj.type == "error"
 
 
-def parse_formula(formula: str) -> Formula:
-    lex.lex(reflags=re.UNICODE)
-    yacc.yacc(write_tables=False)
-    parsed_formula = yacc.parse(formula)
+PARSER_TABLES_MODULE = "alphabetalogic.parsetab"
+
+_parser_lock = threading.Lock()
+_parser_prototype = None
+_lexer_prototype = None
+_thread_state = threading.local()
+
+
+def build_parser(write_tables: bool = False):
+    """
+    Build the lexer and the LALR parser.
+
+    Parser tables are loaded from ``PARSER_TABLES_MODULE`` when its signature
+    matches the grammar, otherwise they are generated in memory.
+
+    Parameters
+    ----------
+    write_tables: bool
+        Write the generated tables to ``parsetab.py`` next to this module.
+
+    Returns
+    -------
+    tuple
+        A (lexer, parser) pair.
+    """
+    module = sys.modules[__name__]
+    lexer = lex.lex(module=module, reflags=re.UNICODE)
+    parser = yacc.yacc(
+        module=module,
+        tabmodule=PARSER_TABLES_MODULE if not write_tables else "parsetab",
+        outputdir=os.path.dirname(os.path.abspath(__file__)),
+        write_tables=write_tables,
+        debug=False,
+    )
+    return lexer, parser
+
+
+def get_parser():
+    """
+    Return the lexer and parser for the current thread.
+
+    The LALR tables are built once per process. Every thread gets its own
+    shallow copy of the parser (shared tables, separate parse stacks) and a
+    clone of the lexer, so the parser can be reused repeatedly and concurrently.
+    """
+    global _parser_prototype, _lexer_prototype
+
+    state = _thread_state.__dict__
+    if "parser" in state:
+        return state["lexer"], state["parser"]
+
+    if _parser_prototype is None:
+        with _parser_lock:
+            if _parser_prototype is None:
+                _lexer_prototype, _parser_prototype = build_parser()
+
+    state["lexer"] = _lexer_prototype.clone()
+    state["parser"] = copy.copy(_parser_prototype)
+    return state["lexer"], state["parser"]
+
+
+def parse_formula(formula: str, backend: str = "ply") -> Formula:
+    """
+    Parse a logical expression in infix notation.
+
+    Parameters
+    ----------
+    formula: str
+        The logical expression to parse.
+    backend: str
+        ``"ply"`` for the LALR parser defined in this module or ``"iterative"`` for the
+        hand-written parser from ``iterative_parser``, which accepts the same grammar,
+        is several times faster and does not recurse on nesting.
+
+    Returns
+    -------
+    Formula
+        The parsed formula.
+    """
+    if backend == "iterative":
+        parsed_formula = parse_iterative(formula)
+        if parsed_formula is not None:
+            parsed_formula.index_variables()
+        return parsed_formula
+    if backend != "ply":
+        raise ValueError(f"Unknown parser backend: {backend}")
+    lexer, parser = get_parser()
+    try:
+        parsed_formula = parser.parse(formula, lexer=lexer)
+    finally:
+        # the reused parser must not keep the last formula alive through its stacks
+        parser.symstack = parser.statestack = None
+        lexer.input("")
     parsed_formula.to_prefix_notation()
+    parsed_formula.index_variables()
     return parsed_formula
+
+
+if os.environ.get("ALPHABETALOGIC_PRELOAD_PARSER"):
+    get_parser()
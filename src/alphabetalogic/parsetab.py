@@ -0,0 +1,44 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'CONJUNCTION DISJUNCTION EQUALITY IMPLICATION LPAREN NEGATION RPAREN VARIABLE\n    formula : atom\n    formula : conjunction\n    formula : equality\n    formula : negation\n    formula : negation_with_parens\n    formula : disjunction\n    formula : implication\n    \n    atom : VARIABLE\n    \n    conjunction : LPAREN formula CONJUNCTION formula RPAREN\n    \n    equality : LPAREN formula EQUALITY formula RPAREN\n    \n    negation : NEGATION formula\n    \n    negation_with_parens : LPAREN NEGATION formula RPAREN\n    \n    implication : LPAREN formula IMPLICATION formula RPAREN\n    \n    disjunction : LPAREN formula DISJUNCTION formula RPAREN\n    '
+    
+_lr_action_items = {'VARIABLE':([0,10,11,13,15,16,17,18,],[9,9,9,9,9,9,9,9,]),'LPAREN':([0,10,11,13,15,16,17,18,],[10,10,10,10,10,10,10,10,]),'NEGATION':([0,10,11,13,15,16,17,18,],[11,13,11,11,11,11,11,11,]),'$end':([1,2,3,4,5,6,7,8,9,14,24,25,26,27,28,],[0,-1,-2,-3,-4,-5,-6,-7,-8,-11,-12,-9,-10,-14,-13,]),'CONJUNCTION':([2,3,4,5,6,7,8,9,12,14,19,24,25,26,27,28,],[-1,-2,-3,-4,-5,-6,-7,-8,15,-11,-11,-12,-9,-10,-14,-13,]),'EQUALITY':([2,3,4,5,6,7,8,9,12,14,19,24,25,26,27,28,],[-1,-2,-3,-4,-5,-6,-7,-8,16,-11,-11,-12,-9,-10,-14,-13,]),'DISJUNCTION':([2,3,4,5,6,7,8,9,12,14,19,24,25,26,27,28,],[-1,-2,-3,-4,-5,-6,-7,-8,17,-11,-11,-12,-9,-10,-14,-13,]),'IMPLICATION':([2,3,4,5,6,7,8,9,12,14,19,24,25,26,27,28,],[-1,-2,-3,-4,-5,-6,-7,-8,18,-11,-11,-12,-9,-10,-14,-13,]),'RPAREN':([2,3,4,5,6,7,8,9,14,19,20,21,22,23,24,25,26,27,28,],[-1,-2,-3,-4,-5,-6,-7,-8,-11,24,25,26,27,28,-12,-9,-10,-14,-13,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'formula':([0,10,11,13,15,16,17,18,],[1,12,14,19,20,21,22,23,]),'atom':([0,10,11,13,15,16,17,18,],[2,2,2,2,2,2,2,2,]),'conjunction':([0,10,11,13,15,16,17,18,],[3,3,3,3,3,3,3,3,]),'equality':([0,10,11,13,15,16,17,18,],[4,4,4,4,4,4,4,4,]),'negation':([0,10,11,13,15,16,17,18,],[5,5,5,5,5,5,5,5,]),'negation_with_parens':([0,10,11,13,15,16,17,18,],[6,6,6,6,6,6,6,6,]),'disjunction':([0,10,11,13,15,16,17,18,],[7,7,7,7,7,7,7,7,]),'implication':([0,10,11,13,15,16,17,18,],[8,8,8,8,8,8,8,8,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> formula","S'",1,None,None,None),
+  ('formula -> atom','formula',1,'p_formula','parser.py',90),
+  ('formula -> conjunction','formula',1,'p_formula','parser.py',91),
+  ('formula -> equality','formula',1,'p_formula','parser.py',92),
+  ('formula -> negation','formula',1,'p_formula','parser.py',93),
+  ('formula -> negation_with_parens','formula',1,'p_formula','parser.py',94),
+  ('formula -> disjunction','formula',1,'p_formula','parser.py',95),
+  ('formula -> implication','formula',1,'p_formula','parser.py',96),
+  ('atom -> VARIABLE','atom',1,'p_atom','parser.py',103),
+  ('conjunction -> LPAREN formula CONJUNCTION formula RPAREN','conjunction',5,'p_conjunction','parser.py',110),
+  ('equality -> LPAREN formula EQUALITY formula RPAREN','equality',5,'p_equality','parser.py',119),
+  ('negation -> NEGATION formula','negation',2,'p_negation','parser.py',128),
+  ('negation_with_parens -> LPAREN NEGATION formula RPAREN','negation_with_parens',4,'p_negation_with_parens','parser.py',136),
+  ('implication -> LPAREN formula IMPLICATION formula RPAREN','implication',5,'p_implication','parser.py',144),
+  ('disjunction -> LPAREN formula DISJUNCTION formula RPAREN','disjunction',5,'p_disjunction','parser.py',153),
+]
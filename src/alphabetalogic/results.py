@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+TAUTOLOGY = "tautology"
+SATISFIABLE = "satisfiable"
+CONTRADICTION = "contradiction"
+# the check ran out of its budget before reaching a verdict
+UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """
+    Verdict of a check, with a counterexample when there is one.
+
+    Attributes
+    ----------
+    verdict: str
+        ``TAUTOLOGY``, ``SATISFIABLE`` (true in some rows and false in others) or
+        ``CONTRADICTION``; ``UNKNOWN`` if the check ran out of its budget.
+    counterexample: dict
+        Assignment, by variable letter, that falsifies the formula, or None.
+    stats: dict
+        Engine specific statistics, such as the number of rows checked; for an unknown
+        result the work done and the exceeded limit (``"reason"``).
+    """
+
+    verdict: str
+    counterexample: Optional[Dict[str, int]] = None
+    stats: Dict[str, object] = field(default_factory=dict, compare=False)
+
+    @property
+    def is_tautology(self) -> bool:
+        return self.verdict == TAUTOLOGY
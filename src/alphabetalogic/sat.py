@@ -0,0 +1,434 @@
+import heapq
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from .budget import BudgetMeter
+from .dag import CONJUNCTION, DISJUNCTION, EQUALITY, IMPLICATION, NEGATION, VARIABLE, FormulaTable, Node
+from .formula import Formula
+from .results import CONTRADICTION, SATISFIABLE, TAUTOLOGY, CheckResult
+
+# activity of the variables decays by this factor at every conflict
+_VARIABLE_DECAY = 0.95
+# conflicts before the first restart; later restarts follow the Luby sequence
+_RESTART_BASE = 100
+_RESCALE_LIMIT = 1e100
+
+
+class CNF(NamedTuple):
+    """
+    Clauses of a Tseitin encoding, as lists of DIMACS literals.
+
+    Attributes
+    ----------
+    clauses: list
+        Clauses; a literal is a variable number, negative for its negation.
+    variables: dict
+        Variable number of every letter of the formula.
+    count: int
+        Number of variables, auxiliary ones included.
+    root: int
+        Literal equivalent to the whole formula.
+    """
+
+    clauses: List[List[int]]
+    variables: Dict[str, int]
+    count: int
+    root: int
+
+
+def tseitin(formula: Union[Formula, Node], table: FormulaTable = None) -> CNF:
+    """
+    Encode a formula into equisatisfiable clauses with the Tseitin transformation.
+
+    The formula is interned, so every distinct subformula gets one auxiliary variable,
+    whatever its polarity, defined by the clauses of its connective; negations are
+    literals and add nothing. The root literal is not asserted: add ``[cnf.root]`` to
+    ask whether the formula is satisfiable, ``[-cnf.root]`` whether its negation is.
+
+    Parameters
+    ----------
+    formula: Formula or Node
+        The formula, or a node of ``table``.
+    table: FormulaTable
+        Table of the node; a new one if a ``Formula`` is given without it.
+
+    Returns
+    -------
+    CNF
+        The clauses, variables and root literal.
+    """
+    if not isinstance(formula, Node):
+        formula = (table or FormulaTable()).intern(formula)
+    variables = {}
+    definitions = {}
+    literals = {}
+    clauses = []
+    count = 0
+    stack = [formula]
+    while stack:
+        node = stack[-1]
+        if node.id in literals:
+            stack.pop()
+            continue
+        if node.kind == VARIABLE:
+            if node.letter not in variables:
+                count += 1
+                variables[node.letter] = count
+            stack.pop()
+            literal = variables[node.letter]
+            literals[node.id] = -literal if node.negation else literal
+            continue
+        pending = [argument for argument in node.arguments if argument.id not in literals]
+        if pending:
+            stack.extend(reversed(pending))
+            continue
+        stack.pop()
+        arguments = tuple(literals[argument.id] for argument in node.arguments)
+        if node.kind == NEGATION:
+            literal = -arguments[0]
+        else:
+            # complementary nodes share the definition of the positive one
+            key = (node.kind, arguments)
+            literal = definitions.get(key)
+            if literal is None:
+                count += 1
+                literal = definitions[key] = count
+                clauses.extend(_definition(node.kind, literal, *arguments))
+        literals[node.id] = -literal if node.negation else literal
+    return CNF(clauses, variables, count, literals[formula.id])
+
+
+def _definition(kind: str, x: int, a: int, b: int) -> list:
+    """Clauses of ``x <=> (a kind b)``."""
+    if kind == CONJUNCTION:
+        return [[-x, a], [-x, b], [x, -a, -b]]
+    if kind == DISJUNCTION:
+        return [[-x, a, b], [x, -a], [x, -b]]
+    if kind == IMPLICATION:
+        return [[-x, -a, b], [x, a], [x, -b]]
+    if kind == EQUALITY:
+        return [[-x, -a, b], [-x, a, -b], [x, a, b], [x, -a, -b]]
+    raise ValueError(f"Unknown connective: {kind}")
+
+
+def _luby(index: int) -> int:
+    """Element ``index`` (from 0) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    size, power = 1, 0
+    while size < index + 1:
+        power += 1
+        size = 2 * size + 1
+    while size - 1 != index:
+        size = (size - 1) >> 1
+        power -= 1
+        index %= size
+    return 1 << power
+
+
+class Solver:
+    """
+    Conflict driven clause learning SAT solver.
+
+    Clauses are watched by two literals, so propagation visits a clause only when one
+    of its watched literals becomes false. A conflict is analysed to its first unique
+    implication point; the learnt clause is added and the search jumps back to the
+    second highest level in it. Decisions take the unassigned variable of highest
+    activity (VSIDS: variables in learnt clauses are bumped and all activities decay),
+    with the value it last had (phase saving). The search restarts after a number of
+    conflicts given by the Luby sequence.
+
+    Internally a literal is ``2 * variable`` for the variable and ``2 * variable + 1``
+    for its negation.
+
+    Parameters
+    ----------
+    count: int
+        Number of variables, numbered from 1.
+    clauses: list
+        Clauses of DIMACS literals.
+    """
+
+    def __init__(self, count: int, clauses: List[List[int]] = ()):
+        self.count = count
+        size = 2 * count + 2
+        # value of every literal: 1 true, 0 false, -1 unassigned
+        self.values = [-1] * size
+        self.watches = [[] for _ in range(size)]
+        self.level = [0] * (count + 1)
+        self.reason = [None] * (count + 1)
+        self.activity = [0.0] * (count + 1)
+        # saved phase: 1 to try the negative literal first
+        self.phase = [1] * (count + 1)
+        self.trail = []
+        self.trail_limits = []
+        self.head = 0
+        self.increment = 1.0
+        self.heap = [(0.0, variable) for variable in range(1, count + 1)]
+        self.learnt = []
+        self.conflicts = 0
+        self.decisions = 0
+        self.ok = True
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def add_clause(self, clause: List[int]):
+        """Add a clause of DIMACS literals; only before ``solve`` or between calls."""
+        literals = []
+        for literal in clause:
+            internal = 2 * literal if literal > 0 else -2 * literal + 1
+            if internal ^ 1 in literals:
+                return
+            if internal not in literals:
+                literals.append(internal)
+        if self.trail_limits:
+            self._backtrack(0)
+        literals = [literal for literal in literals if self.values[literal] != 0]
+        if any(self.values[literal] == 1 for literal in literals):
+            return
+        if not literals:
+            self.ok = False
+        elif len(literals) == 1:
+            self._assign(literals[0], None)
+            self.ok = self.ok and self._propagate() is None
+        else:
+            self._watch(literals)
+
+    def _watch(self, clause: list):
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def _assign(self, literal: int, reason):
+        values = self.values
+        values[literal] = 1
+        values[literal ^ 1] = 0
+        variable = literal >> 1
+        self.level[variable] = len(self.trail_limits)
+        self.reason[variable] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        """Propagate the assignments on the trail; return a conflicting clause or None."""
+        values = self.values
+        watches = self.watches
+        trail = self.trail
+        while self.head < len(trail):
+            false_literal = trail[self.head] ^ 1
+            self.head += 1
+            watching = watches[false_literal]
+            kept = []
+            for position, clause in enumerate(watching):
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+                first = clause[0]
+                if values[first] == 1:
+                    kept.append(clause)
+                    continue
+                for index in range(2, len(clause)):
+                    if values[clause[index]] != 0:
+                        clause[1], clause[index] = clause[index], false_literal
+                        watches[clause[1]].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if values[first] == 0:
+                        kept.extend(watching[position + 1:])
+                        watches[false_literal] = kept
+                        return clause
+                    self._assign(first, clause)
+            watches[false_literal] = kept
+        return None
+
+    def _analyze(self, conflict: list):
+        """Return the learnt clause, asserting literal first, and the level to jump back to."""
+        seen = set()
+        learnt = [None]
+        level = self.level
+        current = len(self.trail_limits)
+        counter = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for other in clause if literal is None else clause[1:]:
+                variable = other >> 1
+                if variable not in seen and level[variable] > 0:
+                    seen.add(variable)
+                    self._bump(variable)
+                    if level[variable] == current:
+                        counter += 1
+                    else:
+                        learnt.append(other)
+            while self.trail[index] >> 1 not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            clause = self.reason[literal >> 1]
+            seen.discard(literal >> 1)
+            counter -= 1
+            if counter == 0:
+                break
+        learnt[0] = literal ^ 1
+        if len(learnt) == 1:
+            return learnt, 0
+        # the literal of the highest remaining level is the second watch
+        best = max(range(1, len(learnt)), key=lambda position: level[learnt[position] >> 1])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, level[learnt[1] >> 1]
+
+    def _bump(self, variable: int):
+        activity = self.activity
+        activity[variable] += self.increment
+        if activity[variable] > _RESCALE_LIMIT:
+            for index in range(1, self.count + 1):
+                activity[index] *= 1 / _RESCALE_LIMIT
+            self.increment *= 1 / _RESCALE_LIMIT
+            self.heap = [(-activity[index], index) for index in range(1, self.count + 1) if self.values[2 * index] == -1]
+            heapq.heapify(self.heap)
+        elif self.values[2 * variable] == -1:
+            heapq.heappush(self.heap, (-activity[variable], variable))
+
+    def _backtrack(self, target: int):
+        if len(self.trail_limits) <= target:
+            return
+        values = self.values
+        start = self.trail_limits[target]
+        for literal in self.trail[start:]:
+            variable = literal >> 1
+            values[literal] = values[literal ^ 1] = -1
+            self.reason[variable] = None
+            self.phase[variable] = literal & 1
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.trail_limits[target:]
+        self.head = start
+        if len(self.heap) > 4 * self.count + 64:
+            # drop the stale entries of bumped and reassigned variables
+            self.heap = [
+                (-self.activity[index], index) for index in range(1, self.count + 1) if values[2 * index] == -1
+            ]
+            heapq.heapify(self.heap)
+
+    def _decide(self) -> Optional[int]:
+        heap = self.heap
+        values = self.values
+        while heap:
+            variable = heapq.heappop(heap)[1]
+            if values[2 * variable] == -1:
+                return 2 * variable + self.phase[variable]
+        return None
+
+    def solve(self, meter: BudgetMeter = None) -> Optional[Dict[int, bool]]:
+        """
+        Search for a satisfying assignment.
+
+        Parameters
+        ----------
+        meter: BudgetMeter
+            If given, every decision is charged as a node and every conflict as a
+            branch; ``BudgetExceeded`` stops the search.
+
+        Returns
+        -------
+        dict
+            Value of every variable, or None if the clauses are unsatisfiable.
+        """
+        if not self.ok:
+            return None
+        restarts = 0
+        limit = _RESTART_BASE * _luby(restarts)
+        since_restart = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                since_restart += 1
+                if meter is not None:
+                    meter.charge(branches=1)
+                if not self.trail_limits:
+                    self.ok = False
+                    return None
+                learnt, target = self._analyze(conflict)
+                self._backtrack(target)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self._watch(learnt)
+                    self.learnt.append(learnt)
+                    self._assign(learnt[0], learnt)
+                self.increment /= _VARIABLE_DECAY
+                continue
+            if since_restart >= limit:
+                restarts += 1
+                limit = _RESTART_BASE * _luby(restarts)
+                since_restart = 0
+                self._backtrack(0)
+                continue
+            literal = self._decide()
+            if literal is None:
+                return {variable: self.values[2 * variable] == 1 for variable in range(1, self.count + 1)}
+            self.decisions += 1
+            if meter is not None:
+                meter.charge(nodes=1)
+            self.trail_limits.append(len(self.trail))
+            self._assign(literal, None)
+
+
+def find_model(formula: Union[Formula, Node], meter: BudgetMeter = None) -> Optional[Dict[str, int]]:
+    """
+    Return an assignment, by variable letter, that makes the formula true, or None.
+
+    Parameters
+    ----------
+    formula: Formula or Node
+        The formula.
+    meter: BudgetMeter
+        Budget of the search.
+
+    Returns
+    -------
+    dict
+        Value, 0 or 1, of every variable of the formula, or None if it is not satisfiable.
+    """
+    cnf = tseitin(formula)
+    solver = Solver(cnf.count, cnf.clauses)
+    solver.add_clause([cnf.root])
+    model = solver.solve(meter)
+    if model is None:
+        return None
+    return {letter: int(model[variable]) for letter, variable in sorted(cnf.variables.items())}
+
+
+def check_sat(formula: Formula, meter: BudgetMeter = None) -> CheckResult:
+    """
+    Classify a formula with the SAT solver.
+
+    The formula is encoded once; the negation is solved first, and a model of it is
+    the counterexample. Only if there is one is the formula itself solved, on the same
+    clauses, to tell a satisfiable formula from a contradiction.
+
+    Parameters
+    ----------
+    formula: Formula
+        The formula, not negated.
+    meter: BudgetMeter
+        Budget shared by both searches.
+
+    Returns
+    -------
+    CheckResult
+        The verdict, the falsifying assignment and the numbers of decisions and conflicts.
+    """
+    cnf = tseitin(formula)
+    solver = Solver(cnf.count, cnf.clauses)
+    solver.add_clause([-cnf.root])
+    model = solver.solve(meter)
+    stats = {"variables": cnf.count, "clauses": len(cnf.clauses)}
+    if model is None:
+        stats.update(decisions=solver.decisions, conflicts=solver.conflicts)
+        return CheckResult(TAUTOLOGY, None, stats)
+    counterexample = {letter: int(model[variable]) for letter, variable in sorted(cnf.variables.items())}
+    decisions, conflicts = solver.decisions, solver.conflicts
+    # clauses learnt above may rest on the negated root, so the search starts afresh
+    solver = Solver(cnf.count, cnf.clauses)
+    solver.add_clause([cnf.root])
+    verdict = SATISFIABLE if solver.solve(meter) is not None else CONTRADICTION
+    stats.update(decisions=decisions + solver.decisions, conflicts=conflicts + solver.conflicts)
+    return CheckResult(verdict, counterexample, stats)
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Optional, Union
+
+from .results import CheckResult
+
+# part of every key; bump it when an engine changes the results it gives
+ENGINE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT NOT NULL,
+    engine_version INTEGER NOT NULL,
+    verdict TEXT NOT NULL,
+    counterexample TEXT,
+    PRIMARY KEY (key, engine_version)
+)
+"""
+
+# verdict column of the results of the boolean checks
+_BOOLEANS = {"true": True, "false": False}
+
+
+def formula_hash(namespace: str, key: str) -> str:
+    """SHA-256 of a kind of check and the canonical key of a formula."""
+    return hashlib.sha256(f"{namespace}\0{key}".encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """
+    Check results kept in an SQLite file, so that they outlive the process.
+
+    Rows are keyed by ``formula_hash`` and ``ENGINE_VERSION`` and hold the verdict
+    and the counterexample, as JSON. The database runs in write-ahead log mode, in
+    which readers do not block each other or the writer, so one file can be shared by
+    the worker processes of a service. Every thread, and every process after a fork,
+    opens its own connection.
+
+    Parameters
+    ----------
+    path: str
+        Path of the database file; it is created if it does not exist.
+    timeout: float
+        Seconds a writer waits for a lock held by another connection.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connection().execute(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            local.connection.execute("PRAGMA journal_mode=WAL")
+            local.connection.execute("PRAGMA synchronous=NORMAL")
+            local.pid = os.getpid()
+        return local.connection
+
+    def close(self):
+        """Close the connection of the calling thread."""
+        local = self._local
+        if getattr(local, "pid", None) == os.getpid():
+            local.connection.close()
+        local.pid = None
+
+    def __len__(self):
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM results WHERE engine_version = ?", (ENGINE_VERSION,)
+        ).fetchone()[0]
+
+    def get(self, namespace: str, key: str) -> Optional[Union[bool, CheckResult]]:
+        """
+        Return the stored result of a check, or None.
+
+        Parameters
+        ----------
+        namespace: str
+            Kind of the check.
+        key: str
+            Canonical key of the formula.
+
+        Returns
+        -------
+        bool or CheckResult
+            The result, as it was passed to ``put``, without its statistics.
+        """
+        row = self._connection().execute(
+            "SELECT verdict, counterexample FROM results WHERE key = ? AND engine_version = ?",
+            (formula_hash(namespace, key), ENGINE_VERSION),
+        ).fetchone()
+        if row is None:
+            return None
+        verdict, counterexample = row
+        if verdict in _BOOLEANS:
+            return _BOOLEANS[verdict]
+        return CheckResult(verdict, None if counterexample is None else json.loads(counterexample))
+
+    def put(self, namespace: str, key: str, result: Union[bool, CheckResult]):
+        """Store the result of a check: the answer of a boolean check or a ``CheckResult``."""
+        if isinstance(result, CheckResult):
+            verdict = result.verdict
+            counterexample = None if result.counterexample is None else json.dumps(result.counterexample)
+        else:
+            verdict = "true" if result else "false"
+            counterexample = None
+        self._connection().execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (formula_hash(namespace, key), ENGINE_VERSION, verdict, counterexample),
+        )
@@ -1,12 +1,19 @@
-import itertools
-import re
-
 import matplotlib.pyplot as plt
 import networkx as nx
-from ply import lex, yacc
 
+from typing import Optional
+
+from .bdd import BDDManager, TRUE, check_bdd
+from .budget import Budget, BudgetExceeded, BudgetMeter
 from .formula import Formula, Variable
-from .utils import Vertex
+from .nnf import NormalForm
+from .parser import parse_formula
+from .results import CONTRADICTION, SATISFIABLE, TAUTOLOGY, UNKNOWN, CheckResult
+from .sat import check_sat, find_model
+from .tableaux_decision import tableau_closes
+from .tableaux_expander import TableauxExpander
+from .truth_table import check_bitsliced, check_parallel, check_rows, find_counterexample
+from .utils import CLOSED_BRANCH_COLOR, Vertex
 
 
 class Tree:
@@ -29,15 +36,26 @@ class Tree:
         Slownik zawierajacy oznaczenia polaczen.
     color_map: list
         Lista zawierajaca zmapowana kolorystyke dla poszczegolnych wezlow.
+    colors: dict
+        Kolory wezlow ustawione dla wizualizacji; wezly bez koloru maja domyslny.
     order: dict
         Kolejnosc w ktorej wyrazenia maja byc rozwijane.
+    expander: TableauxExpander
+        Obiekt rozwijajacy wyrazenia; ``priority`` jest przekazywane do niego.
     """
 
-    def __init__(self):
+    def __init__(self, priority=None):
         self.edges = []
+        self.children = {}
+        self.parent = {}
+        self.leaves = {}
+        self.literals = {}
+        self.closed = set()
+        self.variable_ids = {}
+        self.colors = {}
         self.root = None
         self.stack = None
-        self.graph = nx.Graph()
+        self._graph = None
         self.labels = {}
         self.edge_labels = {}
         self.color_map = []
@@ -49,24 +67,106 @@ class Tree:
             "Implication": 4,
             "Equality": 5,
         }
+        self.expander = TableauxExpander(self, priority)
+
+    @property
+    def graph(self) -> nx.Graph:
+        """Graph used for visualization, created on first use."""
+        if self._graph is None:
+            self._graph = nx.Graph()
+        return self._graph
+
+    @graph.setter
+    def graph(self, value):
+        self._graph = value
 
     def sort(self, arguments):
         return sorted(arguments, key=lambda x: self.order[type(x).__name__])
 
-    def grow(self):
+    def add_edges(self, edges: list):
         """
-        Recursively decompose the expression according to the rules of the analytical tableaux method.
+        Dodaj polaczenia do drzewa i uaktualnij indeksy.
+
+        Every new leaf gets the literals of its branch, as a pair of bitmasks of the
+        positive and the negative literals. A branch closes as soon as a literal and its
+        complement are both on it, which is a single ``positive & negative`` test; the
+        closed node and anything added below it are never open leaves again.
+
+        Parameters
+        ----------
+        edges: list
+            Lista polaczen (``Vertex``), w ktorej poczatek kazdego polaczenia jest juz w drzewie.
+        """
+        for edge in edges:
+            beg, end = edge.beg, edge.end
+            self.edges.append(edge)
+            self.children.setdefault(beg, []).append(end)
+            self.parent[end] = beg
+            self.leaves.pop(beg, None)
+
+            literals = self.literals.get(beg)
+            if literals is None:
+                literals = self.add_literal((0, 0), beg)
+            if beg in self.closed:
+                self.closed.add(end)
+            elif isinstance(end, Variable):
+                literals = self.add_literal(literals, end)
+                if literals[0] & literals[1]:
+                    self.closed.add(end)
+            self.literals[end] = literals
+            if end not in self.closed:
+                self.leaves[end] = None
+        # only leaves are extended, so inner nodes do not need their literals any more
+        for edge in edges:
+            self.literals.pop(edge.beg, None)
+
+    def add_literal(self, literals: tuple, node) -> tuple:
         """
-        current_stack = self.stack
-        self.stack = []
-        for argument in current_stack:
-            functors, connections = self.expander.expand(argument)  # Use the expander
-            self.edges.extend(connections)
-            self.stack.extend([o for o in functors if not isinstance(o, Variable)])
+        Add a node to the literal bitmasks of a branch; nodes other than variables are skipped.
 
-        if self.stack:
-            self.grow()
+        The bit of a variable is its ``index``, given by the parser. Variables built
+        without one get an id from ``variable_ids``.
 
+        Parameters
+        ----------
+        literals: tuple
+            Bitmasks (positive, negative) of the branch.
+        node: Formula
+            The node added to the branch.
+
+        Returns
+        -------
+        tuple
+            The bitmasks of the extended branch.
+        """
+        if not isinstance(node, Variable):
+            return literals
+        index = node.index
+        if index is None:
+            index = self.variable_ids.setdefault(node.letter, len(self.variable_ids))
+        positive, negative = literals
+        if node.negation:
+            return positive, negative | (1 << index)
+        return positive | (1 << index), negative
+
+    def grow(self, meter: BudgetMeter = None):
+        """
+        Decompose the expression according to the rules of the analytical tableaux method.
+
+        Parameters
+        ----------
+        meter: BudgetMeter
+            Budget of the expansion, passed to ``TableauxExpander.grow``.
+        """
+        if not self.edges:
+            # the root has been replaced by its cleared form, which is where expansion starts
+            self.root = list(self.stack)
+            for node in self.root:
+                self.literals[node] = self.add_literal((0, 0), node)
+                self.leaves[node] = None
+        self.expander.stack = self.stack
+        self.expander.grow(meter)
+        self.stack = self.expander.stack
 
     def find_leaf_nodes(self, edges: list, start_node) -> list:
         """
@@ -75,7 +175,7 @@ class Tree:
         Parameters
         ----------
         edges : list
-            Lista polaczen.
+            Lista polaczen; dla ``self.edges`` uzywany jest indeks drzewa.
         start_node : object
             Wezel poczatkowy.
 
@@ -84,104 +184,85 @@ class Tree:
         leaf_nodes: list
             Lista znalezionych wezlow.
         """
+        children = self.children
+        if edges is not self.edges:
+            children = {}
+            for edge in edges:
+                children.setdefault(edge.beg, []).append(edge.end)
 
         leaf_nodes = []
-        successors = [edge.end for edge in edges if edge.beg == start_node]
-        if len(successors) == 0:
-            leaf_nodes.append(start_node)
-
-        else:
-            for successor in successors:
-                leaf_nodes.extend(self.find_leaf_nodes(edges, successor))
+        stack = [start_node]
+        while stack:
+            node = stack.pop()
+            successors = children.get(node)
+            if successors:
+                stack.extend(reversed(successors))
+            else:
+                leaf_nodes.append(node)
         return leaf_nodes
 
     def get_end(self, node) -> list:
-        """ """
-        # print('Do znalezienia: ', node.exp)
-        found_nodes = self.find_leaf_nodes(self.edges, node)
-        # print('Zwrocone liście', [node.exp for node in found_nodes],"\n")
-        return found_nodes
+        """Return the leaves below ``node``, or the node itself when it has no successors."""
+        if node not in self.children:
+            return [node]
+        return self.find_leaf_nodes(self.edges, node)
+
+    def get_open_ends(self, node) -> list:
+        """Return the leaves below ``node`` whose branches are still open; closed subtrees are skipped."""
+        open_ends = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current in self.closed:
+                continue
+            successors = self.children.get(current)
+            if successors:
+                stack.extend(reversed(successors))
+            else:
+                open_ends.append(current)
+        return open_ends
+
+    def color_branch(self, end_node: object, color: str = CLOSED_BRANCH_COLOR):
+        """Color the nodes of the branch ending at ``end_node`` for visualization, in ``colors``."""
+        current_node = end_node
+        while current_node is not None:
+            if self.colors.get(current_node) == color:
+                # the rest of the branch is shared with a branch colored before
+                break
+            self.colors[current_node] = color
+            current_node = self.parent.get(current_node)
 
     def get_branch(self, end_node: object, set_color: bool) -> set:
         """
         Get all expressions in a branch from the root to the given leaf node.
-        
+
+        The branch is followed through the parent index, so the cost is the length of
+        the branch.
+
         Parameters
         ----------
         end_node : object
             The leaf node at the end of the branch.
         set_color : bool
             Whether to color the branch for visualization.
-            
+
         Returns
         -------
         set
             A set of all expressions in the branch.
         """
-        pairs = []
+        if set_color:
+            self.color_branch(end_node)
+        pairs = set()
         current_node = end_node
-        
-        # Add the leaf node expression
-        if hasattr(end_node, 'exp'):
-            pairs.append(end_node.exp)
-            
-        # Handle the special case when there are no edges
-        if not self.edges:
-            if self.root and hasattr(self.root[0], 'exp'):
-                pairs.append(self.root[0].exp)
-            return set(pairs)
-            
-        # Traverse the branch from leaf to root
-        connections_len = len(self.edges) - 1
-        i = connections_len
-        while i >= 0:
-            if self.edges[i].end == current_node:
-                # Color the node if needed
-                if set_color:
-                    self.edges[i].end.color = "#d77c2b"
-                
-                # Add expressions to the branch
-                if hasattr(self.edges[i].end, 'exp'):
-                    pairs.append(self.edges[i].end.exp)
-                if hasattr(self.edges[i].beg, 'exp'):
-                    pairs.append(self.edges[i].beg.exp)
-                
-                # Move up to the parent node
-                current_node = self.edges[i].beg
-                i = connections_len  # Restart the search from the top
-            else:
-                i -= 1
-                
-        # Color the root if needed
-        if set_color and current_node:
-            current_node.color = "#d77c2b"
-            
-        # Add root node if we didn't encounter it in the traversal
-        if self.root and self.root[0] not in pairs and hasattr(self.root[0], 'exp'):
-            pairs.append(self.root[0].exp)
-            
-        return set(pairs)
+        while current_node is not None:
+            if hasattr(current_node, "exp"):
+                pairs.add(current_node.exp)
+            current_node = self.parent.get(current_node)
 
-
-
-class Vertex:
-    """
-    Klasa reprezentujaca polaczenie dwoch wezlow.
-
-    Attributes
-    ----------
-        beg: object
-            Poczatek wezla.
-        end: object
-            Koniec wezla.
-        desc: str
-            Opis wyrazenia znajdujacego sie w wezle.
-    """
-
-    def __init__(self, beg, end, desc):
-        self.beg = beg
-        self.end = end
-        self.desc: str = desc
+        if self.root and hasattr(self.root[0], "exp"):
+            pairs.add(self.root[0].exp)
+        return pairs
 
 
 def check_contradictions(expressions: set) -> bool:
@@ -199,77 +280,173 @@ def check_contradictions(expressions: set) -> bool:
         Returns True if contradictory expressions are found.
     """
     for expression in expressions:
-        if isinstance(expression, str):
-            if expression.startswith("~"):
-                negation = expression[1:]
-                if negation in expressions:
-                    print(f"Contradictory expressions: {expression} and {negation}")
-                    return True
-            else:
-                negation = "~" + expression
-                if negation in expressions:
-                    print(f"Contradictory expressions: {expression} and {negation}")
-                    return True
-    print("No contradictory expressions found.")
+        # every pair has a negated member, so only those are looked up
+        if isinstance(expression, str) and expression.startswith("~"):
+            if expression[1:] in expressions:
+                return True
     return False
 
 
 def parse_pl_formula_infix_notation(text: str) -> Formula:
-    tree = Tree()
-    lex.lex(reflags=re.UNICODE)
-    yacc.yacc(write_tables=False)
-    formula = yacc.parse(text)
-    print(formula.__dict__)
-    formula.to_prefix_notation()
-    return formula
+    return parse_formula(text)
 
 
-def check_if_tautology(formula: str) -> bool:
+def build_tree(formula: str, meter: BudgetMeter = None) -> Tree:
+    """
+    Zbuduj pelne drzewo tableau dla wyrazenia, z polaczeniami, opisami i kolorami.
+
+    Parameters
+    ----------
+    formula: str
+        Wyrazenie krz w formie napisu.
+    meter: BudgetMeter
+        Limit of the expansion; ``BudgetExceeded`` is raised when it runs out.
+
+    Returns
+    -------
+    Tree
+        Rozwiniete drzewo; galezie zamkniete sa pokolorowane.
+    """
+    tree = Tree()
+    parsed_formula = parse_pl_formula_infix_notation(formula)
+    tree.root = [parsed_formula]
+    tree.stack = tree.expander.clear([parsed_formula])
+    tree.grow(meter)
+    for leaf in tree.get_end(tree.root[0]):
+        if leaf in tree.closed:
+            tree.color_branch(leaf)
+    return tree
+
+
+def check_if_tautology(
+    formula: str, trace: bool = False, budget: Budget = None, engine: str = "tableau"
+) -> Optional[bool]:
     """
     Sprawdz czy wyrazenie jest tautologia.
 
+    By default only the decision is computed (``tableaux_decision.tableau_closes``),
+    without building the tree; ``build_tree`` builds it for presentation. With
+    ``engine="sat"`` the formula is checked for satisfiability by the CDCL solver
+    (``sat.find_model``) and with ``engine="bdd"`` its BDD is compared with the ``0``
+    terminal; ``check_formula`` with the same engines also gives the falsifying
+    assignment.
+
     Parameters
     ----------
-    tree: Tree
-        Obiekt przechowujacy informacje o wezlach i polaczeniach.
     formula: str
         Wyrazenie krz w formie napisu.
+    trace: bool
+        Zbuduj pelne drzewo i wypisz stan kazdej galezi.
+    budget: Budget
+        Limits of the check; ``check_formula`` reports the work done when they run out.
+    engine: str
+        ``"tableau"``, ``"sat"`` or ``"bdd"``; ``trace`` needs the tableau.
+
     Returns
     -------
     bool
-        Zwroc True jesli wszystkie galezie zawieraja sprzecznosc.
+        Zwroc True jesli wszystkie galezie zawieraja sprzecznosc; None if the budget ran out.
     """
-
-    parsed_formula = parse_pl_formula_infix_notation(formula)
-    tree.clear([parsed_formula])
-    tree.grow()
-    check = []
+    if engine not in ("tableau", "sat", "bdd"):
+        raise ValueError(f"Unknown engine: {engine}")
+    if trace and engine != "tableau":
+        raise ValueError("trace needs the tableau engine")
+    meter = None if budget is None else budget.start()
+    try:
+        if engine == "sat":
+            return find_model(parse_pl_formula_infix_notation(formula), meter) is None
+        if engine == "bdd":
+            with BDDManager() as manager:
+                negated = manager.negate(manager.from_formula(parse_pl_formula_infix_notation(formula), meter))
+                return negated == TRUE
+        if not trace:
+            return tableau_closes(parse_pl_formula_infix_notation(formula), meter=meter)
+        tree = build_tree(formula, meter)
+    except BudgetExceeded:
+        return None
     for i, leaf in enumerate(tree.get_end(tree.root[0])):
-        check.append(check_contradictions(tree.get_branch(leaf, False)))
-        if check[i]:
-            tree.get_branch(leaf, True)
-        print(f"Galaz numer. {i + 1} {check[i]} ")
-
-    if all(check):
-        return True
-    else:
-        return False
-
-
-def check_with_table(formula: str) -> bool:
-    print("\nMetoda tablic: ")
-    f = parse_pl_formula_infix_notation(formula[1:])
-    variables = sorted(set({o.letter for o in f.registry if isinstance(o, Variable)}))
-    all_01_combinations = list(itertools.product([0, 1], repeat=len(variables)))
-    results = list()
-    for combination in all_01_combinations:
-        variables_dict = {k: v for k, v in zip(variables, combination)}
-        Formula().set_values(variables_dict)
-        result = f.get_value()
-        print(f"{variables_dict} => {result}")
-        results.append(result)
-
-    return all(results)
+        print(f"Galaz numer. {i + 1} {leaf in tree.closed} ")
+    return not tree.leaves
+
+
+def check_with_table(formula: str, engine: str = "rows") -> bool:
+    """
+    Check with the truth table method whether a formula is a tautology.
+
+    The rows are generated lazily and the check stops at the first row in which the
+    formula is false; ``truth_table`` has functions for samples of rows and for
+    writing the full table to a file.
+
+    Parameters
+    ----------
+    formula: str
+        The negated formula, as in ``tautologies``; the leading ``~`` is dropped.
+    engine: str
+        ``"rows"`` evaluates the rows one by one, ``"bitslice"`` checks the whole
+        table with bitwise operations on words (``truth_table.check_bitsliced``) and
+        ``"parallel"`` splits it between processes (``truth_table.check_parallel``).
+
+    Returns
+    -------
+    bool
+        True if the formula is true in every row.
+    """
+    compiled = parse_pl_formula_infix_notation(formula[1:]).compile()
+    if engine == "bitslice":
+        return check_bitsliced(compiled).is_tautology
+    if engine == "parallel":
+        return check_parallel(compiled).is_tautology
+    return find_counterexample(compiled) is None
+
+
+def check_formula(formula: str, engine: str = "tableau", budget: Budget = None) -> CheckResult:
+    """
+    Classify a formula as a tautology, satisfiable or a contradiction, within a budget.
+
+    Parameters
+    ----------
+    formula: str
+        The formula itself, not negated.
+    engine: str
+        ``"tableau"`` normalizes the formula once and runs the decision-only tableau for
+        its negation and, if that does not close, for the formula; ``"rows"`` and ``"bitslice"`` check the truth
+        table (``truth_table.check_rows`` and ``truth_table.check_bitsliced``) and
+        ``"sat"`` runs the CDCL solver on the Tseitin encoding (``sat.check_sat``);
+        ``"bdd"`` builds the reduced ordered BDD (``bdd.check_bdd``).
+    budget: Budget
+        Limits shared by all the work of the check. Node and branch limits apply to the
+        tableau, to the solver, which counts decisions as nodes and conflicts as
+        branches, and to the BDD, whose new nodes count as nodes; time and memory
+        limits apply to every engine.
+
+    Returns
+    -------
+    CheckResult
+        The verdict, or ``UNKNOWN`` with the work done and the exceeded limit in ``stats``.
+    """
+    meter = (budget or Budget()).start()
+    parsed = parse_pl_formula_infix_notation(formula)
+    try:
+        if engine == "tableau":
+            normal = NormalForm(parsed)
+            if tableau_closes(normal.negation(), meter=meter):
+                verdict = TAUTOLOGY
+            elif tableau_closes(normal, meter=meter):
+                verdict = CONTRADICTION
+            else:
+                verdict = SATISFIABLE
+            return CheckResult(verdict, stats=meter.stats())
+        if engine == "rows":
+            return check_rows(parsed.compile(), meter=meter)
+        if engine == "bitslice":
+            return check_bitsliced(parsed.compile(), meter=meter)
+        if engine == "sat":
+            return check_sat(parsed, meter)
+        if engine == "bdd":
+            return check_bdd(parsed, meter)
+    except BudgetExceeded as exceeded:
+        return CheckResult(UNKNOWN, stats=dict(exceeded.stats, reason=exceeded.reason))
+    raise ValueError(f"Unknown engine: {engine}")
 
 
 tautologies = [
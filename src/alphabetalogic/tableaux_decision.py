@@ -0,0 +1,180 @@
+from array import array
+from typing import Union
+
+from .budget import BudgetMeter
+from .dag import CONJUNCTION, DISJUNCTION, VARIABLE, FormulaTable
+from .formula import Formula
+from .nnf import NormalForm
+from .parity import ParitySystem, parity_row
+
+class TableauStore:
+    """
+    Tableau recorded as parallel arrays, one entry per node.
+
+    A node is an index into the arrays; its formula is an interned node of ``table``,
+    so no formula objects, edges or notation strings are kept per tableau node.
+
+    Attributes
+    ----------
+    table: FormulaTable
+        Table of the interned formulas of the nodes.
+    parent: array
+        Index of the parent node, -1 for the root.
+    rule: array
+        Index of the node whose expansion added the node, -1 for the root.
+    formula: array
+        Id of the interned formula of the node in ``table``.
+    polarity: bytearray
+        1 if the formula is true on the branch, 0 if it is false.
+    open_leaves: array
+        Leaves of the open branches.
+    closed_leaves: array
+        Leaves at which a branch closed.
+    """
+
+    def __init__(self):
+        self.table = FormulaTable()
+        self.parent = array("i")
+        self.rule = array("i")
+        self.formula = array("i")
+        self.polarity = bytearray()
+        self.open_leaves = array("i")
+        self.closed_leaves = array("i")
+
+    def __len__(self):
+        return len(self.formula)
+
+    def append(self, parent: int, rule: int, formula: int, polarity: bool) -> int:
+        """Add a node and return its index."""
+        self.parent.append(parent)
+        self.rule.append(rule)
+        self.formula.append(formula)
+        self.polarity.append(polarity)
+        return len(self.formula) - 1
+
+    def branch(self, index: int) -> list:
+        """Return the indices of the nodes from the root to the given node."""
+        nodes = []
+        while index != -1:
+            nodes.append(index)
+            index = self.parent[index]
+        nodes.reverse()
+        return nodes
+
+    def exp(self, index: int) -> str:
+        """Notation of the node, with ``~`` in front of a formula that is false on the branch."""
+        notation = self.table.node(self.formula[index]).exp
+        return notation if self.polarity[index] else "~" + notation
+
+
+def tableau_closes(
+    formula: Union[Formula, NormalForm], store: TableauStore = None, meter: BudgetMeter = None
+) -> bool:
+    """
+    Decide whether every branch of the tableau for the formula closes.
+
+    The formula is interned and rewritten once into negation normal form (``NormalForm``),
+    so the expansion is pure dispatch on conjunctions, disjunctions and literals, with no
+    signs to resolve and nothing mutated. Only the state needed for the answer is kept:
+    every open branch is a tuple of two persistent lists, of formulas still to expand and
+    of postponed disjunctions, with the literals of the branch as bitmasks of positive and
+    negative variable ids. No ``Tree``, ``Vertex`` objects, notation strings or colors are
+    built. Conjunctions are expanded before a branch is split, and branches are explored
+    depth first from an explicit stack.
+
+    A formula is normalized with ``parity``, so equalities of variables, negations and
+    equalities stay whole instead of splitting the branch once per equality. Such an
+    equality is a linear equation over GF(2) (``parity.parity_row``); once a branch has
+    one, the equations and the literals of the branch are kept in a ``ParitySystem``,
+    solved by Gaussian elimination as they arrive, and the branch closes when the system
+    becomes inconsistent. A chain of n equalities then costs a pass over the chain rather
+    than 2^n branches, and only the non-linear rest of the formula is split.
+
+    Parameters
+    ----------
+    formula: Formula or NormalForm
+        The formula, for example the negation of a candidate tautology. A ``NormalForm``
+        is used as it is, so one normalization can serve several checks.
+    store: TableauStore
+        If given, every node of the explored tableau is recorded in it: the formula as
+        given, then its normal form and the nodes grown from it. The search stops at the
+        first open branch, so the store then holds the tableau up to that branch. The
+        store takes the table of a ``NormalForm``.
+    meter: BudgetMeter
+        If given, every node and branch is charged to it, and ``BudgetExceeded`` stops
+        the search when the budget runs out.
+
+    Returns
+    -------
+    bool
+        True if every branch contains a contradiction, that is the formula is not satisfiable.
+    """
+    if not isinstance(formula, NormalForm):
+        formula = NormalForm(formula, store.table if store is not None else None, parity=True)
+    elif store is not None:
+        store.table = formula.table
+    tip = -1
+    if store is not None:
+        tip = store.append(-1, -1, formula.source.id, formula.sign)
+    ids = {}
+    rows = {}
+    # a branch: (pending, postponed, positive, negative, parity system or None, tip);
+    # lists are (item, rest) pairs and an item is (node, index of the node whose rule
+    # produced it)
+    stack = [(((formula.root, tip), None), None, 0, 0, None, tip)]
+    if meter is not None:
+        meter.charge(branches=1)
+    while stack:
+        pending, postponed, positive, negative, system, tip = stack.pop()
+        closed = False
+        while True:
+            if pending is not None:
+                (node, rule), pending = pending
+                if meter is not None:
+                    meter.charge(nodes=1)
+                if store is not None:
+                    tip = store.append(tip, rule, node.id, True)
+                kind = node.kind
+                if kind == VARIABLE:
+                    bit = 1 << ids.setdefault(node.letter, len(ids))
+                    if node.negation:
+                        negative |= bit
+                    else:
+                        positive |= bit
+                    if positive & negative or system is not None and not system.add(bit, not node.negation):
+                        closed = True
+                        break
+                elif kind == CONJUNCTION:
+                    left, right = node.arguments
+                    pending = ((right, tip), ((left, tip), pending))
+                elif kind == DISJUNCTION:
+                    postponed = ((node, tip), postponed)
+                else:
+                    # a linear equality: one more equation of the branch
+                    if system is None:
+                        system = ParitySystem()
+                        for literals, value in ((positive, 1), (negative, 0)):
+                            while literals:
+                                bit = literals & -literals
+                                system.add(bit, value)
+                                literals ^= bit
+                    mask, constant = parity_row(node, ids, rows)
+                    if not system.add(mask, 1 ^ constant):
+                        closed = True
+                        break
+            elif postponed is not None:
+                (node, rule), postponed = postponed
+                left, right = node.arguments
+                stack.append((((right, rule), None), postponed, positive, negative, system, tip))
+                if meter is not None:
+                    meter.charge(branches=1)
+                pending = ((left, rule), pending)
+                if system is not None:
+                    system = system.copy()
+            else:
+                break
+        if store is not None:
+            (store.closed_leaves if closed else store.open_leaves).append(tip)
+        if not closed:
+            return False
+    return True
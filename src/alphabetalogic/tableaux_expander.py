@@ -1,18 +1,44 @@
 import copy
-from typing import List
+import heapq
+import itertools
+from typing import Callable, List
 
 from .formula import (Conjunction, Disjunction, Equality, Formula, Implication,
                       Negation, Operator, Variable)
+from .budget import BudgetMeter
 from .utils import Vertex
 
 
+def is_alpha(formula: Formula) -> bool:
+    """Return True if the rule for the formula does not branch."""
+    if isinstance(formula, Conjunction):
+        return not formula.negation
+    if isinstance(formula, (Disjunction, Implication)):
+        return formula.negation
+    return not isinstance(formula, Equality)
+
+
+def _update_notation(formula: Formula):
+    """Update the notation of a copy; an operator's is rebuilt on first access, not for every copy."""
+    if isinstance(formula, Variable):
+        formula.to_prefix_notation()
+    else:
+        formula.exp = None
+
+
+def _description(formula: Formula):
+    """Edge label of an expansion, built only when it is displayed."""
+    counter = Formula.counter
+    return lambda: f"{type(formula).__name__} ({counter}) \n {formula.exp}"
+
+
 class TableauxExpander:
     """
     Class responsible for expanding formulas according to the rules of the analytical tableaux method.
     This decouples the expansion logic from the formula classes.
     """
 
-    def __init__(self, tree):
+    def __init__(self, tree, priority: Callable = None):
         """
         Initialize the expander with a reference to the tableaux tree.
 
@@ -20,10 +46,21 @@ class TableauxExpander:
         ----------
         tree : Tree
             The tableaux tree that will be used for expansion.
+        priority : callable
+            Key of a formula in the worklist; formulas with smaller keys are expanded
+            first and equal keys keep their order. Defaults to ``alpha_first``.
         """
         self.tree = tree
         self.stack = None
         self.nodes = []
+        self.priority = priority or self.alpha_first
+        self._sequence = itertools.count()
+
+    def alpha_first(self, formula: Formula) -> tuple:
+        """
+        Default priority: non-branching rules first, then the rank of the formula in ``tree.order``.
+        """
+        return (not is_alpha(formula), self.tree.order[type(formula).__name__])
 
     def clear(self, formulas: List[Formula]):
         """
@@ -35,30 +72,60 @@ class TableauxExpander:
             Wyrazenie krz w formie obiektu.
         """
 
-        for i in range(len(formulas)):
-            while isinstance(formulas[i], Negation):
-                outer = formulas[i]
-                inner = outer.arguments[0]
-                inner.negation = not outer.negation
-                formulas[i] = inner
-            if not isinstance(formulas[i], Variable):
-                self.clear(formulas[i].arguments)
+        stack = [formulas]
+        while stack:
+            arguments = stack.pop()
+            for i in range(len(arguments)):
+                while isinstance(arguments[i], Negation):
+                    outer = arguments[i]
+                    inner = outer.arguments[0]
+                    inner.negation = not outer.negation
+                    arguments[i] = inner
+                if not isinstance(arguments[i], Variable):
+                    stack.append(arguments[i].arguments)
         return formulas
     
-    def grow(self):
+    def grow(self, meter: BudgetMeter = None):
         """
-        Recursively decompose the expression according to the rules of the analytical tableaux method.
+        Decompose the formulas on the stack according to the rules of the analytical tableaux method.
+
+        The formulas wait in a priority queue ordered by ``priority``, so by default
+        the non-branching rules are applied before any branch is split and their
+        results are not duplicated in every new branch.
+
+        Parameters
+        ----------
+        meter : BudgetMeter
+            If given, the new nodes and open branches of every expansion are charged
+            to it; ``BudgetExceeded`` stops the expansion with the tree as it is.
         """
-        current_stack = self.stack
+        worklist = []
+        self._sequence = itertools.count()
+        for formula in self.stack:
+            self._schedule(worklist, formula)
         self.stack = []
-        for argument in current_stack:
+        open_branches = len(self.tree.leaves)
+        if meter is not None:
+            meter.charge(branches=open_branches)
+        while worklist:
+            argument = heapq.heappop(worklist)[2]
+            if argument in self.tree.closed:
+                continue
             functors, new_nodes = self.expand(argument)  # Use the expander
             self.nodes.extend(new_nodes)
-            self.stack.extend([o for o in functors if not isinstance(o, Variable)])
+            self.tree.add_edges(new_nodes)
+            if meter is not None:
+                # branches opened by the expansion, less any it closed at once
+                leaves = len(self.tree.leaves)
+                meter.charge(nodes=len(new_nodes), branches=max(0, leaves - open_branches))
+                open_branches = leaves
+            for functor in functors:
+                if not isinstance(functor, Variable) and functor not in self.tree.closed:
+                    self._schedule(worklist, functor)
+
+    def _schedule(self, worklist: list, formula: Formula):
+        heapq.heappush(worklist, (self.priority(formula), next(self._sequence), formula))
 
-        if self.stack:
-            self.grow()
-    
     def expand(self, formula):
         """
         Expand a formula according to its type and the rules of the analytical tableaux method.
@@ -139,50 +206,51 @@ class TableauxExpander:
         vertex_list = []
         functors_list = []
         Formula.counter += 1
+        description = _description(formula)
 
         if not formula.negation:
             # Regular conjunction: (A and B) -> A, B on the same branch
-            for f in self.tree.get_end(formula):
+            for f in self.tree.get_open_ends(formula):
                 l_copy, r_copy = copy.copy(l_arg), copy.copy(r_arg)
                 # Make sure to update the expressions
-                l_copy.to_prefix_notation()
-                r_copy.to_prefix_notation()
+                _update_notation(l_copy)
+                _update_notation(r_copy)
                 functors_list.extend([l_copy, r_copy])
                 vertex_list.extend(
                     [
                         Vertex(
                             f,
                             l_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             l_copy,
                             r_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                     ]
                 )
         else:
             # Negated conjunction: ~(A and B) -> ~A or ~B on separate branches
-            for f in self.tree.get_end(formula):
+            for f in self.tree.get_open_ends(formula):
                 l_copy, r_copy = copy.copy(l_arg), copy.copy(r_arg)
-                l_copy.negate()
-                r_copy.negate()
+                l_copy.negation = not l_copy.negation
+                r_copy.negation = not r_copy.negation
                 # Make sure to update the expressions after negation
-                l_copy.to_prefix_notation()
-                r_copy.to_prefix_notation()
+                _update_notation(l_copy)
+                _update_notation(r_copy)
                 functors_list.extend([l_copy, r_copy])
                 vertex_list.extend(
                     [
                         Vertex(
                             f,
                             l_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             f,
                             r_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                     ]
                 )
@@ -196,51 +264,52 @@ class TableauxExpander:
         vertex_list = []
         functors_list = []
         Formula.counter += 1
+        description = _description(formula)
 
         if not formula.negation:
             # Regular disjunction: (A or B) -> A or B on separate branches
-            for f in self.tree.get_end(formula):
+            for f in self.tree.get_open_ends(formula):
                 l_copy, r_copy = copy.copy(l_arg), copy.copy(r_arg)
                 # Make sure to update the expressions
-                l_copy.to_prefix_notation()
-                r_copy.to_prefix_notation()
+                _update_notation(l_copy)
+                _update_notation(r_copy)
                 functors_list.extend([l_copy, r_copy])
                 vertex_list.extend(
                     [
                         Vertex(
                             f,
                             l_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             f,
                             r_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                     ]
                 )
             return functors_list, vertex_list
         else:
             # Negated disjunction: ~(A or B) -> ~A and ~B on the same branch
-            for f in self.tree.get_end(formula):
+            for f in self.tree.get_open_ends(formula):
                 l_copy, r_copy = copy.copy(l_arg), copy.copy(r_arg)
-                l_copy.negate()
-                r_copy.negate()
+                l_copy.negation = not l_copy.negation
+                r_copy.negation = not r_copy.negation
                 # Make sure to update the expressions after negation
-                l_copy.to_prefix_notation()
-                r_copy.to_prefix_notation()
+                _update_notation(l_copy)
+                _update_notation(r_copy)
                 functors_list.extend([l_copy, r_copy])
                 vertex_list.extend(
                     [
                         Vertex(
                             f,
                             l_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             l_copy,
                             r_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                     ]
                 )
@@ -253,51 +322,52 @@ class TableauxExpander:
         vertex_list = []
         functors_list = []
         Formula.counter += 1
+        description = _description(formula)
 
         if not formula.negation:
             # Regular implication: (A => B) -> ~A or B on separate branches
-            for f in self.tree.get_end(formula):
+            for f in self.tree.get_open_ends(formula):
                 l_copy, r_copy = copy.copy(l_arg), copy.copy(r_arg)
-                l_copy.negate()
+                l_copy.negation = not l_copy.negation
                 # Make sure to update the expressions after negation
-                l_copy.to_prefix_notation()
-                r_copy.to_prefix_notation()
+                _update_notation(l_copy)
+                _update_notation(r_copy)
                 functors_list.extend([l_copy, r_copy])
                 vertex_list.extend(
                     [
                         Vertex(
                             f,
                             l_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             f,
                             r_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                     ]
                 )
             return functors_list, vertex_list
         else:
             # Negated implication: ~(A => B) -> A and ~B on the same branch
-            for f in self.tree.get_end(formula):
+            for f in self.tree.get_open_ends(formula):
                 l_copy, r_copy = copy.copy(l_arg), copy.copy(r_arg)
-                r_copy.negate()
+                r_copy.negation = not r_copy.negation
                 # Make sure to update the expressions after negation
-                l_copy.to_prefix_notation()
-                r_copy.to_prefix_notation()
+                _update_notation(l_copy)
+                _update_notation(r_copy)
                 functors_list.extend([l_copy, r_copy])
                 vertex_list.extend(
                     [
                         Vertex(
                             f,
                             l_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             l_copy,
                             r_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                     ]
                 )
@@ -313,24 +383,25 @@ class TableauxExpander:
         vertex_list = []
         functors_list = []
         Formula.counter += 1
+        description = _description(formula)
 
         if not formula.negation:
             # Regular equality: (A <=> B) -> (A and B) or (~A and ~B)
-            for f in self.tree.get_end(formula):
+            for f in self.tree.get_open_ends(formula):
                 l_copy = copy.copy(l_arg)
                 r_copy = copy.copy(r_arg)
 
                 nl_copy = copy.copy(nl_arg)
                 nr_copy = copy.copy(nr_arg)
 
-                nl_copy.negate()
-                nr_copy.negate()
+                nl_copy.negation = not nl_copy.negation
+                nr_copy.negation = not nr_copy.negation
 
                 # Make sure to update the expressions after negation
-                l_copy.to_prefix_notation()
-                r_copy.to_prefix_notation()
-                nl_copy.to_prefix_notation()
-                nr_copy.to_prefix_notation()
+                _update_notation(l_copy)
+                _update_notation(r_copy)
+                _update_notation(nl_copy)
+                _update_notation(nr_copy)
 
                 functors_list.extend([l_copy, nl_copy, r_copy, nr_copy])
 
@@ -339,43 +410,43 @@ class TableauxExpander:
                         Vertex(
                             f,
                             l_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             l_copy,
                             r_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             f,
                             nl_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             nl_copy,
                             nr_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                     ]
                 )
             return functors_list, vertex_list
         else:
             # Negated equality: ~(A <=> B) -> (A and ~B) or (~A and B)
-            for f in self.tree.get_end(formula):
+            for f in self.tree.get_open_ends(formula):
                 l_copy = copy.copy(l_arg)
                 r_copy = copy.copy(r_arg)
 
                 nl_copy = copy.copy(nl_arg)
                 nr_copy = copy.copy(nr_arg)
 
-                nl_copy.negate()
-                nr_copy.negate()
+                nl_copy.negation = not nl_copy.negation
+                nr_copy.negation = not nr_copy.negation
 
                 # Make sure to update the expressions after negation
-                l_copy.to_prefix_notation()
-                r_copy.to_prefix_notation()
-                nl_copy.to_prefix_notation()
-                nr_copy.to_prefix_notation()
+                _update_notation(l_copy)
+                _update_notation(r_copy)
+                _update_notation(nl_copy)
+                _update_notation(nr_copy)
 
                 functors_list.extend([l_copy, nl_copy, nr_copy, r_copy])
 
@@ -384,22 +455,22 @@ class TableauxExpander:
                         Vertex(
                             f,
                             l_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             l_copy,
                             nr_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             f,
                             nl_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                         Vertex(
                             nl_copy,
                             r_copy,
-                            f"{type(formula).__name__} ({Formula.counter}) \n {formula.exp}",
+                            description,
                         ),
                     ]
                 )
@@ -0,0 +1,352 @@
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+from .budget import BudgetMeter
+from .compiler import CompiledFormula
+from .formula import Formula
+from .results import CONTRADICTION, SATISFIABLE, TAUTOLOGY, CheckResult
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+WORD_BITS = 64
+# low variables alternate inside a 64 bit word: bit k of the pattern is bit b of k
+_WORD_PATTERNS = [
+    sum(1 << k for k in range(WORD_BITS) if (k >> b) & 1) for b in range(6)
+]
+_ALL_ONES = (1 << WORD_BITS) - 1
+_ONES_BYTES = b"\xff" * (WORD_BITS // 8)
+_ZERO_BYTES = bytes(WORD_BITS // 8)
+# upper bound on the words held by all registers of a chunk at once
+_CHUNK_MEMORY_WORDS = 1 << 22
+# tables smaller than this (2 ** 22 rows) are not worth starting processes for
+_PARALLEL_MIN_WORDS = 1 << 16
+
+
+def _compiled(formula: Union[Formula, CompiledFormula]) -> CompiledFormula:
+    return formula if isinstance(formula, CompiledFormula) else formula.compile()
+
+
+def _row_assignment(variables: tuple, row: int) -> dict:
+    """Assignment of the given row, in ``itertools.product`` order."""
+    count = len(variables)
+    return {letter: (row >> (count - 1 - index)) & 1 for index, letter in enumerate(variables)}
+
+
+def _verdict(any_true: bool, first_false, variables: tuple, rows: int) -> CheckResult:
+    if first_false is None:
+        verdict = TAUTOLOGY
+    elif any_true:
+        verdict = SATISFIABLE
+    else:
+        verdict = CONTRADICTION
+    counterexample = None if first_false is None else _row_assignment(variables, first_false)
+    return CheckResult(verdict, counterexample, {"rows": rows})
+
+
+def iter_rows(
+    formula: Union[Formula, CompiledFormula], stop_at_false: bool = False
+) -> Iterator[Tuple[tuple, int]]:
+    """
+    Yield the rows of the truth table lazily.
+
+    Rows come in ``itertools.product`` order over the sorted variables of the formula
+    (``formula.compile().variables``); nothing is materialized up front.
+
+    Parameters
+    ----------
+    formula: Formula or CompiledFormula
+        The formula to evaluate.
+    stop_at_false: bool
+        Stop after the first row in which the formula is false.
+
+    Yields
+    ------
+    tuple
+        A (values, result) pair: the value of every variable and the value of the formula.
+    """
+    compiled = _compiled(formula)
+    for combination in itertools.product((0, 1), repeat=len(compiled.variables)):
+        result = compiled(combination)
+        yield combination, result
+        if stop_at_false and not result:
+            return
+
+
+def find_counterexample(formula: Union[Formula, CompiledFormula]) -> Optional[dict]:
+    """Return the first falsifying assignment, by variable letter, or None for a tautology."""
+    compiled = _compiled(formula)
+    for combination, result in iter_rows(compiled, stop_at_false=True):
+        if not result:
+            return dict(zip(compiled.variables, combination))
+    return None
+
+
+def check_rows(formula: Union[Formula, CompiledFormula], meter: BudgetMeter = None) -> CheckResult:
+    """
+    Check the truth table row by row, stopping as soon as the verdict is known.
+
+    Every row is charged to ``meter``, if given, which raises ``BudgetExceeded`` when
+    the budget runs out.
+
+    Returns
+    -------
+    CheckResult
+        Tautology, satisfiable or contradiction, with the first falsifying row.
+    """
+    compiled = _compiled(formula)
+    any_true = False
+    first_false = None
+    rows = 0
+    for rows, (combination, result) in enumerate(iter_rows(compiled), start=1):
+        if meter is not None:
+            meter.charge(rows=1)
+        if result:
+            any_true = True
+        elif first_false is None:
+            first_false = rows - 1
+        if any_true and first_false is not None:
+            break
+    return _verdict(any_true, first_false, compiled.variables, rows)
+
+
+def sample_rows(
+    formula: Union[Formula, CompiledFormula], count: int, seed: int = None
+) -> List[Tuple[tuple, int]]:
+    """
+    Evaluate a random sample of distinct rows of the truth table.
+
+    The rows are drawn without enumerating the table, so this works for any number
+    of variables.
+
+    Parameters
+    ----------
+    formula: Formula or CompiledFormula
+        The formula to evaluate.
+    count: int
+        Number of rows; the whole table if it is smaller.
+    seed: int
+        Seed of the random generator, for reproducible samples.
+
+    Returns
+    -------
+    list
+        (values, result) pairs ordered by row number.
+    """
+    compiled = _compiled(formula)
+    variables = compiled.variables
+    total_rows = 1 << len(variables)
+    rows = sorted(random.Random(seed).sample(range(total_rows), min(count, total_rows)))
+    sample = []
+    for row in rows:
+        combination = tuple(_row_assignment(variables, row).values())
+        sample.append((combination, compiled(combination)))
+    return sample
+
+
+def write_truth_table(formula: Union[Formula, CompiledFormula], file: Union[str, IO]) -> int:
+    """
+    Write the full truth table, tab separated, one row at a time.
+
+    Parameters
+    ----------
+    formula: Formula or CompiledFormula
+        The formula to evaluate.
+    file: str or file object
+        Path or text stream to write to.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+    """
+    if isinstance(file, str):
+        with open(file, "w", encoding="UTF-8") as stream:
+            return write_truth_table(formula, stream)
+
+    compiled = _compiled(formula)
+    file.write("\t".join(compiled.variables + ("result",)) + "\n")
+    rows = 0
+    for combination, result in iter_rows(compiled):
+        file.write("\t".join(map(str, combination)) + f"\t{result}\n")
+        rows += 1
+    return rows
+
+
+def check_bitsliced(
+    formula: Union[Formula, CompiledFormula], chunk_words: int = None, meter: BudgetMeter = None
+) -> CheckResult:
+    """
+    Check every row of the truth table with whole-word bitwise operations.
+
+    Each variable is a column of packed bits, 64 rows per ``uint64`` word, and the
+    compiled formula evaluates a whole chunk of words per operation. Chunks are sized
+    so that the registers of one chunk fit in a fixed amount of memory. The scan stops
+    as soon as the formula is known to be satisfiable but not a tautology. Without
+    NumPy, Python integers are used as the bit columns.
+
+    Parameters
+    ----------
+    formula: Formula or CompiledFormula
+        The formula to check.
+    chunk_words: int
+        Number of 64 bit words evaluated at once; chosen from the program size if not given.
+    meter: BudgetMeter
+        If given, the rows of every chunk are charged to it and its clock and memory
+        limits are checked before every chunk.
+
+    Returns
+    -------
+    CheckResult
+        Tautology, satisfiable or contradiction, with the first falsifying row.
+    """
+    compiled = _compiled(formula)
+    variables = compiled.variables
+    count = len(variables)
+    total_rows = 1 << count
+    total_words = max(1, total_rows // WORD_BITS)
+
+    if total_rows < WORD_BITS:
+        # a single, partial word
+        mask = (1 << total_rows) - 1
+        values = [_WORD_PATTERNS[count - 1 - index] & mask for index in range(count)]
+        result = compiled(values, mask)
+        falsified = result ^ mask
+        first_false = None if not falsified else (falsified & -falsified).bit_length() - 1
+        return _verdict(bool(result), first_false, variables, total_rows)
+
+    any_true, first_false, rows = _scan_words(compiled, 0, total_words, chunk_words, meter)
+    return _verdict(any_true, first_false, variables, rows)
+
+
+def check_parallel(
+    formula: Union[Formula, CompiledFormula], workers: int = None, shard_bits: int = None
+) -> CheckResult:
+    """
+    Check the truth table in a pool of processes, one shard of rows per task.
+
+    A shard fixes the values of the first ``shard_bits`` variables, which makes it a
+    contiguous range of rows checked with ``check_bitsliced``. Workers receive the
+    compiled formula, which pickles to its variables and program only. Once a falsifying
+    row and a satisfying row have been found, the shards that have not started are
+    cancelled. Small tables are checked in this process.
+
+    Parameters
+    ----------
+    formula: Formula or CompiledFormula
+        The formula to check.
+    workers: int
+        Number of processes; ``os.cpu_count()`` if not given.
+    shard_bits: int
+        Number of variables fixed per shard; by default there are about four shards per
+        worker.
+
+    Returns
+    -------
+    CheckResult
+        Tautology, satisfiable or contradiction. The counterexample is the first
+        falsifying row of the earliest shard that found one, not necessarily the first
+        row of the table.
+    """
+    compiled = _compiled(formula)
+    count = len(compiled.variables)
+    workers = workers or os.cpu_count() or 1
+    total_words = (1 << count) // WORD_BITS
+    if shard_bits is None:
+        shard_bits = max(1, (4 * workers - 1).bit_length())
+    shard_bits = min(shard_bits, max(0, count - 6))
+    if workers == 1 or total_words < _PARALLEL_MIN_WORDS or shard_bits == 0:
+        return check_bitsliced(compiled)
+
+    shard_words = total_words >> shard_bits
+    any_true = False
+    first_false = None
+    rows = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_scan_words, compiled, start, start + shard_words)
+            for start in range(0, total_words, shard_words)
+        ]
+        for future in as_completed(futures):
+            shard_any_true, shard_first_false, shard_rows = future.result()
+            rows += shard_rows
+            any_true = any_true or shard_any_true
+            if shard_first_false is not None and (first_false is None or shard_first_false < first_false):
+                first_false = shard_first_false
+            if any_true and first_false is not None:
+                for pending in futures:
+                    pending.cancel()
+                break
+    return _verdict(any_true, first_false, compiled.variables, rows)
+
+
+def _scan_words(
+    compiled: CompiledFormula, start: int, stop: int, chunk_words: int = None, meter: BudgetMeter = None
+):
+    """Check the words ``start .. stop - 1`` chunk by chunk; returns (any_true, first_false, rows)."""
+    if chunk_words is None:
+        chunk_words = max(1, _CHUNK_MEMORY_WORDS // (len(compiled.variables) + len(compiled)))
+    evaluate = _evaluate_numpy if np is not None else _evaluate_integers
+    any_true = False
+    first_false = None
+    rows = 0
+    for chunk_start in range(start, stop, chunk_words):
+        words = min(chunk_words, stop - chunk_start)
+        if meter is not None:
+            meter.poll()
+        chunk_any_true, chunk_first_false = evaluate(compiled, chunk_start, words)
+        if meter is not None:
+            meter.charge(rows=words * WORD_BITS)
+        rows += words * WORD_BITS
+        any_true = any_true or chunk_any_true
+        if first_false is None and chunk_first_false is not None:
+            first_false = chunk_start * WORD_BITS + chunk_first_false
+        if any_true and first_false is not None:
+            break
+    return any_true, first_false, rows
+
+
+def _evaluate_numpy(compiled: CompiledFormula, start: int, words: int):
+    count = len(compiled.variables)
+    ones = np.uint64(_ALL_ONES)
+    word_index = np.arange(start, start + words, dtype=np.uint64)
+    values = []
+    for index in range(count):
+        bit = count - 1 - index
+        if bit < 6:
+            values.append(np.full(words, _WORD_PATTERNS[bit], dtype=np.uint64))
+        else:
+            values.append(((word_index >> np.uint64(bit - 6)) & np.uint64(1)) * ones)
+    result = compiled(values, ones)
+    falsified = np.flatnonzero(result != ones)
+    first_false = None
+    if falsified.size:
+        word = _ALL_ONES ^ int(result[falsified[0]])
+        first_false = int(falsified[0]) * WORD_BITS + (word & -word).bit_length() - 1
+    return bool(result.any()), first_false
+
+
+def _evaluate_integers(compiled: CompiledFormula, start: int, words: int):
+    count = len(compiled.variables)
+    bits = words * WORD_BITS
+    mask = (1 << bits) - 1
+    values = []
+    for index in range(count):
+        bit = count - 1 - index
+        if bit < 6:
+            values.append(int.from_bytes(_WORD_PATTERNS[bit].to_bytes(8, "little") * words, "little"))
+        else:
+            shift = bit - 6
+            column = b"".join(
+                _ONES_BYTES if ((start + word) >> shift) & 1 else _ZERO_BYTES for word in range(words)
+            )
+            values.append(int.from_bytes(column, "little"))
+    result = compiled(values, mask)
+    falsified = result ^ mask
+    first_false = None if not falsified else (falsified & -falsified).bit_length() - 1
+    return bool(result), first_false
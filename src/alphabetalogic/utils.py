@@ -3,6 +3,9 @@ import random
 import matplotlib.pyplot as plt
 import networkx as nx
 
+NODE_COLOR = "#2596be"
+CLOSED_BRANCH_COLOR = "#d77c2b"
+
 
 class Vertex:
     """
@@ -15,18 +18,33 @@ class Vertex:
         end: object
             Koniec wezla.
         desc: str
-            Opis wyrazenia znajdujacego sie w wezle.
+            Opis wyrazenia znajdujacego sie w wezle; moze byc podany jako funkcja
+            zwracajaca opis, wywolywana przy pierwszym odczycie.
     """
 
+    __slots__ = ("beg", "end", "_desc")
+
     def __init__(self, beg, end, desc):
         self.beg = beg
         self.end = end
-        self.desc: str = desc
+        self._desc = desc
+
+    @property
+    def desc(self) -> str:
+        if callable(self._desc):
+            self._desc = self._desc()
+        return self._desc
+
+    @desc.setter
+    def desc(self, value):
+        self._desc = value
+
 
 class GraphVisualizer:
-    def __init__(self, root, nodes):
+    def __init__(self, root, nodes, colors=None):
         self.root = root
         self.nodes = nodes
+        self.colors = colors or {}
         self.graph = nx.Graph()
         self.labels = {}
 
@@ -67,42 +85,22 @@ class GraphVisualizer:
             else:
                 self.root = random.choice(list(self.graph.nodes))
 
-        def _hierarchy_pos(
-            G, root, width=1.0, vert_gap=0.2, vert_loc=0.0, xcenter=0.5, pos=None, parent=None
-        ):
-            """
-            see hierarchy_pos docstring for most arguments
-
-            pos: a dict saying where all nodes go if they have been assigned
-            parent: parent of this branch. - only affects it if non-directed
-
-            """
-
-            if pos is None:
-                pos = {root: (xcenter, vert_loc)}
-            else:
-                pos[root] = (xcenter, vert_loc)
-            children = list(G.neighbors(root))
-            if not isinstance(G, nx.DiGraph) and parent is not None:
+        # positions are assigned from an explicit stack, so deep trees do not recurse
+        pos = {}
+        stack = [(self.root, None, width, xcenter, vert_loc)]
+        while stack:
+            node, parent, branch_width, node_x, node_y = stack.pop()
+            pos[node] = (node_x, node_y)
+            children = list(self.graph.neighbors(node))
+            if not isinstance(self.graph, nx.DiGraph) and parent is not None:
                 children.remove(parent)
             if len(children) != 0:
-                dx = width / len(children)
-                nextx = xcenter - width / 2 - dx / 2
+                dx = branch_width / len(children)
+                nextx = node_x - branch_width / 2 - dx / 2
                 for child in children:
                     nextx += dx
-                    pos = _hierarchy_pos(
-                        G,
-                        child,
-                        width=dx,
-                        vert_gap=vert_gap,
-                        vert_loc=vert_loc - vert_gap,
-                        xcenter=nextx,
-                        pos=pos,
-                        parent=root,
-                    )
-            return pos
-
-        return _hierarchy_pos(self.graph, self.root, width, vert_gap, vert_loc, xcenter)
+                    stack.append((child, node, dx, nextx, node_y - vert_gap))
+        return pos
 
     def display(self):
         self.graph.add_edges_from([[node.beg, node.end] for node in self.nodes])
@@ -112,7 +110,7 @@ class GraphVisualizer:
         for node in self.graph.nodes():
             self.labels[node] = node.exp
 
-        self.color_map = [node.color for node in self.graph]
+        self.color_map = [self.colors.get(node, NODE_COLOR) for node in self.graph]
 
         options = {"edgecolors": "black", "node_size": 1200}
         pos = self.hierarchy_pos()
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from alphabetalogic.asynchronous import AsyncChecker, acheck_satisfiable, acheck_tautology
+
+
+def _blocking(event: threading.Event) -> str:
+    event.wait(5)
+    return "done"
+
+
+def test_default_checker():
+    async def main():
+        return await asyncio.gather(
+            acheck_tautology("((p and (p => q)) => q)"),
+            acheck_tautology("(p => q)"),
+            acheck_satisfiable("(p and ~q)"),
+            acheck_satisfiable("(p and ~p)"),
+        )
+
+    assert asyncio.run(main()) == [True, False, True, False]
+
+
+def test_concurrency_is_bounded():
+    started = []
+
+    def record(formula):
+        started.append(formula)
+        time.sleep(0.05)
+        return formula
+
+    async def main():
+        with ThreadPoolExecutor(4) as executor:
+            checker = AsyncChecker(max_concurrency=2, executor=executor)
+            tasks = [asyncio.ensure_future(checker.run(record, str(index))) for index in range(6)]
+            await asyncio.sleep(0.02)
+            in_flight = len(started)
+            results = await asyncio.gather(*tasks)
+        return in_flight, results
+
+    in_flight, results = asyncio.run(main())
+    assert in_flight == 2
+    assert results == [str(index) for index in range(6)]
+
+
+def test_timeout_and_cancellation_release_the_slot():
+    event = threading.Event()
+    calls = []
+
+    def record(formula):
+        calls.append(formula)
+        return formula
+
+    async def main():
+        with ThreadPoolExecutor(2) as executor:
+            checker = AsyncChecker(max_concurrency=1, executor=executor)
+            with pytest.raises(asyncio.TimeoutError):
+                await checker.run(_blocking, event, timeout=0.05)
+            holding = asyncio.ensure_future(checker.run(_blocking, event))
+            waiting = asyncio.ensure_future(checker.run(record, "cancelled"))
+            await asyncio.sleep(0.02)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            event.set()
+            assert await holding == "done"
+            return await checker.check_tautology("(p or ~p)", timeout=5)
+
+    assert asyncio.run(main())
+    assert calls == []
+
+
+def test_process_pool_is_closed():
+    async def main():
+        async with AsyncChecker(workers=1) as checker:
+            assert await checker.check_satisfiable("(p => q)")
+        return checker
+
+    checker = asyncio.run(main())
+    assert checker._executor is None
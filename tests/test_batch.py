@@ -0,0 +1,44 @@
+import pytest
+from test_utils.load_test_samples import load_logical_expressions
+
+from alphabetalogic import check_many
+from alphabetalogic.tableaux import check_if_tautology
+
+
+def _formulas():
+    tautologies = ["~" + logical_expression for logical_expression in load_logical_expressions()]
+    return tautologies + ["~(p => q)", "~(p or q)", "(p and ~p)", "~((p => q) => p)"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_in_input_order(workers):
+    formulas = _formulas()
+    expected = [check_if_tautology(formula) for formula in formulas]
+    assert list(check_many(iter(formulas), workers=workers, chunksize=3)) == expected
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_as_completed(workers):
+    formulas = _formulas()
+    expected = [check_if_tautology(formula) for formula in formulas]
+    results = list(check_many(formulas, workers=workers, chunksize=2, ordered=False))
+    assert sorted(index for index, _ in results) == list(range(len(formulas)))
+    assert all(result == expected[index] for index, result in results)
+
+
+def test_inputs_are_read_lazily():
+    consumed = []
+
+    def formulas():
+        for index in range(1000):
+            consumed.append(index)
+            yield "~(p or ~p)"
+
+    results = check_many(formulas(), workers=1, chunksize=10)
+    assert next(results) is True
+    assert len(consumed) == 10
+
+
+def test_invalid_chunksize():
+    with pytest.raises(ValueError):
+        list(check_many(["~(p or ~p)"], chunksize=0))
@@ -0,0 +1,113 @@
+import itertools
+import random
+
+import pytest
+from test_utils.load_test_samples import load_logical_expressions
+
+from alphabetalogic.bdd import FALSE, TRUE, BDDManager, check_bdd
+from alphabetalogic.budget import Budget
+from alphabetalogic.parser import parse_formula
+from alphabetalogic.results import CONTRADICTION, SATISFIABLE, TAUTOLOGY, UNKNOWN
+from alphabetalogic.tableaux import check_formula, check_if_tautology, check_with_table, tautologies
+
+
+def _random_formula(generator, depth):
+    if depth == 0 or generator.random() < 0.2:
+        return generator.choice(["p", "q", "r", "s", "~p", "~q"])
+    if generator.random() < 0.15:
+        return "~" + _random_formula(generator, depth - 1)
+    operator = generator.choice(["and", "or", "=>", "<=>"])
+    return f"({_random_formula(generator, depth - 1)} {operator} {_random_formula(generator, depth - 1)})"
+
+
+def _chain(count):
+    formula = "p1"
+    for index in range(2, count + 1):
+        formula = f"(p{index} <=> {formula})"
+    return formula
+
+
+def test_tautologies_are_the_true_terminal():
+    with BDDManager() as manager:
+        for negated in tautologies:
+            assert manager.from_formula(parse_formula(negated[1:])) == TRUE
+        assert manager.from_formula(parse_formula("(p and ~p)")) == FALSE
+
+
+@pytest.mark.parametrize("logical_expression", load_logical_expressions())
+def test_samples(logical_expression):
+    assert check_if_tautology("~" + logical_expression, engine="bdd")
+    assert check_bdd(parse_formula(logical_expression)).verdict == TAUTOLOGY
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_models_and_canonicity(seed):
+    generator = random.Random(seed)
+    manager = BDDManager(cache_size=64)
+    for _ in range(40):
+        formula = parse_formula(_random_formula(generator, 5))
+        compiled = formula.compile()
+        bdd = manager.from_formula(formula)
+        models = sum(compiled(values) for values in itertools.product((0, 1), repeat=len(compiled.variables)))
+        assert manager.count_models(bdd, compiled.variables) == models
+        # the same function always has the same node
+        assert manager.from_formula(parse_formula(f"~~{formula.exp}")) == bdd
+        negated = "~" + formula.exp
+        assert check_if_tautology(negated, engine="bdd") == check_with_table(negated), negated
+        for value in (True, False):
+            assignment = manager.find_assignment(bdd, value)
+            if assignment is None:
+                assert models == (0 if value else 1 << len(compiled.variables))
+                continue
+            row = dict.fromkeys(compiled.variables, 0)
+            row.update(assignment)
+            assert compiled(tuple(row[letter] for letter in compiled.variables)) == value
+
+
+def test_equivalence():
+    with BDDManager() as manager:
+        assert manager.equivalent(parse_formula("~(p and q)"), parse_formula("(~p or ~q)"))
+        assert manager.equivalent(parse_formula("(p => q)"), parse_formula("(~q => ~p)"))
+        assert not manager.equivalent(parse_formula("(p => q)"), parse_formula("(q => p)"))
+
+
+def test_counts_and_support():
+    with BDDManager() as manager:
+        bdd = manager.from_formula(parse_formula("((p or q) and (r or ~r))"))
+        assert manager.support(bdd) == ["p", "q"]
+        assert manager.count_models(bdd) == 3
+        assert manager.count_models(bdd, ["p", "q", "r", "s"]) == 12
+        with pytest.raises(ValueError):
+            manager.count_models(bdd, ["p"])
+        assert manager.size(bdd) == 2
+
+
+def test_long_equality_chain():
+    result = check_formula(f"({_chain(150)} or ~{_chain(150)})", engine="bdd")
+    assert result.verdict == TAUTOLOGY
+    assert result.stats["models"] == 1 << 150
+    result = check_formula(_chain(150), engine="bdd")
+    assert result.verdict == SATISFIABLE
+    assert result.stats["nodes"] == 2 * 150 - 1
+    assert result.stats["models"] == 1 << 149
+
+
+def test_counterexample():
+    result = check_formula("((p => q) => (q => p))", engine="bdd")
+    assert result.counterexample == {"p": 0, "q": 1}
+    assert check_formula("(p and ~p)", engine="bdd").verdict == CONTRADICTION
+
+
+def test_close_releases_the_nodes():
+    manager = BDDManager()
+    manager.from_formula(parse_formula(_chain(20)))
+    assert len(manager) > 2
+    manager.close()
+    assert len(manager) == 2
+    assert manager.letters == []
+
+
+def test_budget():
+    result = check_formula(_chain(100), engine="bdd", budget=Budget(max_nodes=50))
+    assert result.verdict == UNKNOWN
+    assert result.stats["reason"] == "nodes"
@@ -0,0 +1,90 @@
+import pytest
+
+from alphabetalogic import check_many
+from alphabetalogic.budget import Budget, BudgetExceeded
+from alphabetalogic.results import CONTRADICTION, SATISFIABLE, TAUTOLOGY, UNKNOWN
+from alphabetalogic.tableaux import build_tree, check_formula, check_if_tautology
+
+
+def _chain(count):
+    formula = "p1"
+    for index in range(2, count + 1):
+        formula = f"((p{index} and q) <=> {formula})"
+    return formula
+
+
+# true in every row, but no branch of its tableau closes before all equalities are split;
+# the conjunctions keep the equalities from being solved as parity constraints
+HARD_TAUTOLOGY = f"({_chain(8)} or ~{_chain(8)})"
+
+
+@pytest.mark.parametrize("engine", ["tableau", "rows", "bitslice"])
+@pytest.mark.parametrize(
+    "formula, verdict",
+    [("((p and (p => q)) => q)", TAUTOLOGY), ("(p => q)", SATISFIABLE), ("(p and ~p)", CONTRADICTION)],
+)
+def test_verdicts_within_budget(engine, formula, verdict):
+    result = check_formula(formula, engine=engine, budget=Budget(max_nodes=1000, timeout=60))
+    assert result.verdict == verdict
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        check_formula("p", engine="oracle")
+
+
+@pytest.mark.parametrize(
+    "budget, reason",
+    [
+        (Budget(max_nodes=500), "nodes"),
+        (Budget(max_branches=50), "branches"),
+        (Budget(timeout=0), "time"),
+        (Budget(max_memory=1), "memory"),
+    ],
+)
+def test_tableau_stops_at_the_limit(budget, reason):
+    result = check_formula(HARD_TAUTOLOGY, budget=budget)
+    assert result.verdict == UNKNOWN
+    assert result.stats["reason"] == reason
+    assert result.stats["nodes"] > 0
+    if budget.max_nodes is not None:
+        assert result.stats["nodes"] == budget.max_nodes + 1
+    if budget.max_branches is not None:
+        assert result.stats["branches"] == budget.max_branches + 1
+
+
+@pytest.mark.parametrize("engine", ["rows", "bitslice"])
+def test_truth_table_stops_at_the_deadline(engine):
+    result = check_formula(f"({_chain(18)} or ~{_chain(18)})", engine=engine, budget=Budget(timeout=0))
+    assert result.verdict == UNKNOWN
+    assert result.stats["reason"] == "time"
+    assert result.stats["rows"] < 1 << 18
+
+
+def test_check_if_tautology_returns_none(capsys):
+    negated = "~" + HARD_TAUTOLOGY
+    assert check_if_tautology(negated, budget=Budget(max_nodes=200)) is None
+    assert check_if_tautology(negated, trace=True, budget=Budget(max_nodes=200)) is None
+    assert check_if_tautology("~(p or ~p)", budget=Budget(max_nodes=200)) is True
+
+
+def test_tree_expansion_is_charged():
+    with pytest.raises(BudgetExceeded) as exceeded:
+        build_tree("~" + HARD_TAUTOLOGY, Budget(max_branches=20).start())
+    assert exceeded.value.reason == "branches"
+    assert exceeded.value.stats["nodes"] > 0
+
+
+def test_meter_counts():
+    meter = Budget(max_nodes=3).start()
+    meter.charge(nodes=2, branches=1)
+    meter.charge(nodes=1, rows=64)
+    assert (meter.nodes, meter.branches, meter.rows) == (3, 1, 64)
+    with pytest.raises(BudgetExceeded):
+        meter.charge(nodes=1)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_with_budget(workers):
+    formulas = ["~(p or ~p)", "~" + HARD_TAUTOLOGY, "~(p => q)"]
+    assert list(check_many(formulas, workers=workers, budget=Budget(max_nodes=200))) == [True, None, False]
@@ -0,0 +1,93 @@
+import pytest
+
+from alphabetalogic.budget import Budget
+from alphabetalogic.cache import CacheInfo, ResultCache, canonical_key, get_default_cache
+from alphabetalogic.parser import parse_formula
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("(p and (p => q))", "(r and (r=>s))"),
+        ("(q or p)", "(p or q)"),
+        ("~(~p)", "(~~p)"),
+        ("(  p1 <=>   ~ r )", "(s <=> ~t)"),
+    ],
+)
+def test_equal_keys(first, second):
+    assert canonical_key(parse_formula(first)) == canonical_key(parse_formula(second))
+
+
+def test_renaming_by_first_occurrence():
+    assert canonical_key(parse_formula("((r or q) and r)")) == "((p or p1) and p)"
+    assert canonical_key(parse_formula("(p and q)")) != canonical_key(parse_formula("(p and p)"))
+
+
+def test_isomorphic_queries_hit(monkeypatch):
+    cache = ResultCache()
+    assert cache.check_if_tautology("~((p and (p => q)) => q)")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the check ran again")
+
+    monkeypatch.setattr("alphabetalogic.cache.check_if_tautology", fail)
+    monkeypatch.setattr("alphabetalogic.cache.parse_formula", fail)
+    assert cache.check_if_tautology("~((p and (p => q)) => q)")
+    # same tokens up to naming and spacing: found without parsing
+    assert cache.check_if_tautology("~((r and (r=>s))=>s)")
+    assert cache.info() == CacheInfo(hits=2, misses=1, maxsize=4096, currsize=1)
+
+
+def test_parentheses_around_negations_share_the_result(monkeypatch):
+    cache = ResultCache()
+    assert cache.check_if_tautology("~(p or ~p)")
+    monkeypatch.setattr("alphabetalogic.cache.check_if_tautology", lambda *args, **kwargs: 1 / 0)
+    assert cache.check_if_tautology("~(q or (~q))")
+    assert cache.info().hits == 1
+
+
+def test_checks_are_cached_apart():
+    cache = ResultCache()
+    assert cache.check_with_table("~(p or ~p)", engine="bitslice")
+    assert cache.check_if_tautology("~(q or ~q)")
+    assert not cache.check_with_table("~(p or q)")
+    assert cache.info().misses == 3
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResultCache(maxsize=2)
+    cache.check_if_tautology("~(p or ~p)")
+    cache.check_if_tautology("~(p => q)")
+    cache.check_if_tautology("~(p or ~p)")
+    cache.check_if_tautology("~(p and q)")
+    assert cache.info().currsize == 2
+    cache.check_if_tautology("~(p or ~p)")
+    cache.check_if_tautology("~(p => q)")
+    assert (cache.hits, cache.misses) == (2, 4)
+    cache.clear()
+    assert cache.info() == CacheInfo(0, 0, 2, 0)
+
+
+def test_unknown_and_invalid_results_are_not_cached(monkeypatch, capsys):
+    chain = "p1"
+    for index in range(2, 8):
+        chain = f"((p{index} and q) <=> {chain})"
+    cache = ResultCache()
+    assert cache.check_if_tautology(f"~({chain} or ~{chain})", budget=Budget(max_nodes=100)) is None
+    assert cache.info().currsize == 0
+    assert cache.check_if_tautology(f"~({chain} or ~{chain})")
+    assert cache.info().currsize == 1
+    calls = []
+    monkeypatch.setattr("alphabetalogic.cache.check_with_table", lambda *args: calls.append(args))
+    cache.check_with_table("(p or")
+    cache.check_with_table("(p or")
+    assert len(calls) == 2
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        ResultCache(maxsize=0)
+
+
+def test_default_cache():
+    assert get_default_cache() is get_default_cache()
@@ -0,0 +1,58 @@
+import itertools
+import pickle
+
+import pytest
+from test_utils.load_test_samples import load_logical_expressions
+
+from alphabetalogic.compiler import CompiledFormula, compile_formula
+from alphabetalogic.formula import Conjunction, Variable
+from alphabetalogic.parser import parse_formula
+
+
+@pytest.mark.parametrize(
+    "logical_expression",
+    load_logical_expressions() + ["p", "~p", "((p => q) <=> ~(r1 or ~p))"],
+)
+def test_compiled_formula_matches_get_value(logical_expression):
+    formula = parse_formula(logical_expression)
+    compiled = formula.compile()
+    assert list(compiled.variables) == sorted(formula.variable_table())
+    for combination in itertools.product([0, 1], repeat=len(compiled.variables)):
+        formula.set_values(dict(zip(compiled.variables, combination)))
+        assert compiled(combination) == int(formula.get_value())
+
+
+def test_compiled_formula_evaluates_bit_sliced_words():
+    compiled = parse_formula("(p => (q and ~p))").compile()
+    # rows 0..3 in the bits of one word: p = 0011, q = 0101
+    assert compiled((0b0011, 0b0101), mask=0b1111) == 0b1100
+
+
+def test_shared_subformulas_are_computed_once():
+    compiled = parse_formula("((p and q) or ~(p and q))").compile()
+    # (p and q), its negation and the disjunction
+    assert len(compiled) == 3
+
+
+def test_polarity_flags_are_honoured():
+    formula = Conjunction(arguments=[Variable(letter="p"), Variable(letter="q")])
+    formula.negation = True
+    compiled = compile_formula(formula)
+    assert compiled((1, 1)) == 0
+    assert compiled((0, 1)) == 1
+
+
+def test_compiled_formula_is_picklable():
+    compiled = parse_formula("((p and (p => q)) => q)").compile()
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert isinstance(restored, CompiledFormula)
+    assert restored == compiled
+    assert hash(restored) == hash(compiled)
+    assert all(restored(row) == 1 for row in itertools.product([0, 1], repeat=2))
+
+
+def test_deep_formula_compiles():
+    depth = 20000
+    compiled = parse_formula("~" * depth + "p", backend="iterative").compile()
+    assert compiled((1,)) == 1
+    assert compiled((0,)) == 0
@@ -0,0 +1,55 @@
+import pytest
+from test_utils.load_test_samples import load_logical_expressions
+
+from alphabetalogic.dag import CONJUNCTION, FormulaTable, Node
+from alphabetalogic.parser import parse_formula
+
+
+@pytest.fixture
+def table():
+    return FormulaTable()
+
+
+def test_structurally_equal_formulas_share_nodes(table):
+    p = table.variable("p")
+    q = table.variable("q")
+    assert table.variable("p") is p
+    assert table.conjunction(p, q) is table.conjunction(table.variable("p"), table.variable("q"))
+    assert table.conjunction(p, q) is not table.conjunction(q, p)
+    assert table.conjunction(p, q) is not table.conjunction(p, q, negation=True)
+    assert len(table) == 5
+
+
+def test_complement_flips_polarity(table):
+    p = table.variable("p")
+    negated_p = table.complement(p)
+    assert negated_p.negation
+    assert negated_p.exp == "~p"
+    assert table.complement(negated_p) is p
+
+
+def test_nodes_are_immutable(table):
+    p = table.variable("p")
+    with pytest.raises(AttributeError):
+        p.negation = True
+    assert hash(p) == hash(table.variable("p"))
+
+
+def test_intern_shares_repeated_subformulas(table):
+    node = table.intern(parse_formula("((p and q) <=> ~(p and q))"))
+    left, right = node.arguments
+    assert left.kind == CONJUNCTION
+    assert right.arguments[0] is left
+    # p, q, (p and q), ~(p and q) and the equality itself
+    assert len(table) == 5
+
+
+@pytest.mark.parametrize("logical_expression", load_logical_expressions())
+def test_intern_round_trip(table, logical_expression):
+    formula = parse_formula(logical_expression)
+    node = table.intern(formula)
+    assert isinstance(node, Node)
+    assert node.exp == formula.exp
+    rebuilt = table.to_formula(node)
+    assert rebuilt.exp == formula.exp
+    assert table.intern(rebuilt) is node
@@ -0,0 +1,69 @@
+import copy
+import gc
+import itertools
+import weakref
+
+import pytest
+
+from alphabetalogic.formula import Conjunction, Formula, Variable
+from alphabetalogic.parser import parse_formula
+
+
+def test_formulas_are_released():
+    formula = parse_formula("((p and q) => ~r)")
+    reference = weakref.ref(formula.arguments[0])
+    del formula
+    gc.collect()
+    assert reference() is None
+    assert not hasattr(Formula, "registry")
+
+
+def test_variable_table_groups_variables_of_the_formula():
+    formula = parse_formula("((p and q) => (~p or r1))")
+    table = formula.variable_table()
+    assert list(table) == ["p", "q", "r1"]
+    assert len(table["p"]) == 2
+    assert all(isinstance(variable, Variable) for variables in table.values() for variable in variables)
+
+
+def test_set_values_touches_only_the_evaluated_formula():
+    other = Variable(letter="p")
+    other.set_value(1)
+    formula = Conjunction(arguments=[Variable(letter="p"), Variable(letter="q")])
+    formula.set_values({"p": 0, "q": 1})
+    assert formula.get_value() == 0
+    assert other.get_value() == 1
+
+
+@pytest.mark.parametrize("logical_expression", ["(p => (q <=> ~(p or q)))", "~((p and ~q) or (q => p))"])
+def test_get_value_matches_compiled_formula(logical_expression):
+    formula = parse_formula(logical_expression)
+    compiled = formula.compile()
+    for combination in itertools.product([0, 1], repeat=2):
+        values = dict(zip(compiled.variables, combination))
+        formula.set_values(values)
+        assert int(formula.get_value()) == compiled.evaluate(values)
+
+
+def test_get_value_of_deep_formula():
+    formula = Variable(letter="p")
+    for _ in range(50000):
+        formula = Conjunction(arguments=[formula, Variable(letter="q")])
+    formula.set_values({"p": 1, "q": 1})
+    assert formula.get_value() == 1
+
+
+def test_formulas_are_slotted_and_copyable():
+    formula = parse_formula("((p and q) => ~r)")
+    variable = formula.arguments[0].arguments[0]
+    for node in (formula, variable):
+        assert not hasattr(node, "__dict__")
+
+    clone = copy.copy(variable)
+    assert clone is not variable
+    assert (clone.letter, clone.index, clone.negation, clone.exp) == ("p", 0, False, "p")
+    assert not hasattr(clone, "value")
+
+    clone = copy.copy(formula)
+    assert clone.arguments is formula.arguments
+    assert (clone.exp, clone.is_self_standing) == (formula.exp, formula.is_self_standing)
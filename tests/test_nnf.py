@@ -0,0 +1,99 @@
+import itertools
+import random
+
+import pytest
+
+from alphabetalogic.dag import CONJUNCTION, DISJUNCTION, VARIABLE, FormulaTable
+from alphabetalogic.nnf import NormalForm, to_nnf
+from alphabetalogic.parser import parse_formula
+from alphabetalogic.tableaux_decision import TableauStore, tableau_closes
+
+
+def _random_formula(generator, depth):
+    if depth == 0 or generator.random() < 0.2:
+        return generator.choice(["p", "q", "r", "~p", "~q"])
+    if generator.random() < 0.15:
+        return "~" + _random_formula(generator, depth - 1)
+    operator = generator.choice(["and", "or", "=>", "<=>"])
+    return f"({_random_formula(generator, depth - 1)} {operator} {_random_formula(generator, depth - 1)})"
+
+
+def _nodes(root):
+    seen = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.id not in seen:
+            seen[node.id] = node
+            stack.extend(node.arguments)
+    return seen.values()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_normal_form_is_equivalent(seed):
+    generator = random.Random(seed)
+    for _ in range(30):
+        formula = parse_formula(_random_formula(generator, 5))
+        normal = NormalForm(formula)
+        for node in _nodes(normal.root):
+            assert node.kind in (VARIABLE, CONJUNCTION, DISJUNCTION)
+            assert not node.negation or node.kind == VARIABLE
+        compiled = formula.compile()
+        for sign, candidate in ((True, normal), (False, normal.negation())):
+            rewritten = normal.table.to_formula(candidate.root).compile()
+            for values in itertools.product((0, 1), repeat=len(compiled.variables)):
+                assignment = dict(zip(compiled.variables, values))
+                expected = compiled(values) if sign else 1 - compiled(values)
+                assert rewritten(tuple(assignment[letter] for letter in rewritten.variables)) == expected
+
+
+def test_examples():
+    assert NormalForm(parse_formula("~(p => q)")).exp == "(p and ~q)"
+    assert NormalForm(parse_formula("(p <=> q)")).exp == "((p and q) or (~p and ~q))"
+    assert NormalForm(parse_formula("(p <=> q)")).negation().exp == "((p and ~q) or (~p and q))"
+    assert NormalForm(parse_formula("~(~p or ~~q)")).exp == "(p and ~q)"
+
+
+def test_shared_arguments_are_rewritten_once():
+    table = FormulaTable()
+    formula = parse_formula("((p and q) <=> ((p and q) => r))")
+    memo = {}
+    to_nnf(table, table.intern(formula), memo=memo)
+    conjunction = table.intern(parse_formula("(p and q)"))
+    assert (conjunction.id, True) in memo and (conjunction.id, False) in memo
+    assert len(memo) == len(set(memo))
+
+
+def test_normal_form_is_reused_and_the_formula_is_not_mutated():
+    formula = parse_formula("~((p and (p => q)) => q)")
+    normal = NormalForm(formula)
+    assert tableau_closes(normal)
+    assert not tableau_closes(normal.negation())
+    table_size = len(normal.table)
+    for _ in range(3):
+        assert tableau_closes(normal)
+        assert not tableau_closes(normal.negation())
+    # the normal forms are built once and shared by later checks
+    assert len(normal.table) == table_size
+    assert formula.exp == "~((p and (p => q)) => q)"
+
+
+def test_deep_formula():
+    body = "p"
+    for index in range(20000):
+        body = f"({body} <=> q)" if index % 2 else f"~(p => {body})"
+    normal = NormalForm(parse_formula(body))
+    assert normal.root.kind in (CONJUNCTION, DISJUNCTION)
+
+
+def test_store_starts_with_the_formula_and_its_normal_form():
+    normal = NormalForm(parse_formula("~(p => q)"))
+    store = TableauStore()
+    assert not tableau_closes(normal, store)
+    assert store.table is normal.table
+    assert [store.exp(index) for index in store.branch(store.open_leaves[0])] == [
+        "~(p => q)",
+        "(p and ~q)",
+        "~q",
+        "p",
+    ]
@@ -1,11 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from test_utils.load_test_samples import load_logical_expressions
 
-from alphabetalogic.formula import Formula
-from alphabetalogic.parser import parse_formula
+from alphabetalogic.formula import Conjunction, Formula, Negation, Variable
+from alphabetalogic.parser import get_parser, parse_formula
 
 
 @pytest.mark.parametrize("logical_expression", load_logical_expressions())
 def test_parser_return(logical_expression):
     parsed_sample = parse_formula(logical_expression)
     assert isinstance(parsed_sample, Formula)
+
+
+def test_parser_is_built_once():
+    first_lexer, first_parser = get_parser()
+    parse_formula("(p and q)")
+    second_lexer, second_parser = get_parser()
+    assert first_parser is second_parser
+    assert first_lexer is second_lexer
+
+
+def test_parser_is_thread_safe():
+    expressions = load_logical_expressions()
+    expected = [parse_formula(expression).exp for expression in expressions]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda e: parse_formula(e).exp, expressions * 20))
+    assert results == expected * 20
+
+
+def _structure(formula):
+    if isinstance(formula, Variable):
+        return formula.letter, formula.is_self_standing
+    return (
+        type(formula).__name__,
+        formula.is_self_standing,
+        tuple(_structure(argument) for argument in formula.arguments),
+    )
+
+
+@pytest.mark.parametrize(
+    "logical_expression",
+    load_logical_expressions() + ["(~p)", "(~~p1 and ~(q23 <=> (~r)))", "~~(p => (~q))"],
+)
+def test_iterative_backend_matches_ply(logical_expression):
+    ply_formula = parse_formula(logical_expression)
+    iterative_formula = parse_formula(logical_expression, backend="iterative")
+    assert _structure(iterative_formula) == _structure(ply_formula)
+    assert iterative_formula.exp == ply_formula.exp
+
+
+@pytest.mark.parametrize("logical_expression", ["(p and q", "(p)", "p q", "((~p))", ""])
+def test_iterative_backend_rejects_like_ply(logical_expression):
+    with pytest.raises(AttributeError):
+        parse_formula(logical_expression)
+    assert parse_formula(logical_expression, backend="iterative") is None
+
+
+def test_iterative_backend_deep_formula():
+    depth = 100000
+    negations = parse_formula("~" * depth + "p", backend="iterative")
+    assert isinstance(negations, Negation)
+    assert len(negations.exp) == depth + 1
+
+    conjunctions = parse_formula("(" * depth + "p" + " and q)" * depth, backend="iterative")
+    assert isinstance(conjunctions, Conjunction)
+    assert conjunctions.exp.startswith("(" * depth + "p and q) and q)")
+    assert len(conjunctions.exp) == depth * len("( and q)") + 1
+
+
+@pytest.mark.parametrize("backend", ["ply", "iterative"])
+def test_variables_get_dense_ids(backend):
+    formula = parse_formula("((r and p) => (~r or q1))", backend=backend)
+    table = formula.variable_table()
+    assert {letter: {variable.index for variable in variables} for letter, variables in table.items()} == {
+        "r": {2},
+        "p": {0},
+        "q1": {1},
+    }
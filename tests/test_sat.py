@@ -0,0 +1,146 @@
+import itertools
+import random
+
+import pytest
+from test_utils.load_test_samples import load_logical_expressions
+
+from alphabetalogic.budget import Budget
+from alphabetalogic.parser import parse_formula
+from alphabetalogic.results import CONTRADICTION, SATISFIABLE, TAUTOLOGY, UNKNOWN
+from alphabetalogic.sat import Solver, _luby, check_sat, find_model, tseitin
+from alphabetalogic.tableaux import check_formula, check_if_tautology, check_with_table
+
+
+def _random_formula(generator, depth):
+    if depth == 0 or generator.random() < 0.2:
+        return generator.choice(["p", "q", "r", "~p", "~q"])
+    if generator.random() < 0.15:
+        return "~" + _random_formula(generator, depth - 1)
+    operator = generator.choice(["and", "or", "=>", "<=>"])
+    return f"({_random_formula(generator, depth - 1)} {operator} {_random_formula(generator, depth - 1)})"
+
+
+def _satisfiable(count, clauses):
+    return any(
+        all(any(values[abs(literal) - 1] == (literal > 0) for literal in clause) for clause in clauses)
+        for values in itertools.product((False, True), repeat=count)
+    )
+
+
+def _pigeonhole(holes):
+    variable = lambda pigeon, hole: pigeon * holes + hole + 1  # noqa: E731
+    clauses = [[variable(pigeon, hole) for hole in range(holes)] for pigeon in range(holes + 1)]
+    for hole in range(holes):
+        for first, second in itertools.combinations(range(holes + 1), 2):
+            clauses.append([-variable(first, hole), -variable(second, hole)])
+    return (holes + 1) * holes, clauses
+
+
+def test_luby():
+    assert [_luby(index) for index in range(15)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_solver_agrees_with_enumeration(seed):
+    generator = random.Random(seed)
+    for _ in range(100):
+        count = generator.randint(3, 10)
+        clauses = [
+            [generator.choice((-1, 1)) * generator.randint(1, count) for _ in range(generator.randint(1, 3))]
+            for _ in range(generator.randint(1, 5 * count))
+        ]
+        model = Solver(count, clauses).solve()
+        assert (model is not None) == _satisfiable(count, clauses), clauses
+        if model is not None:
+            assert all(any(model[abs(literal)] == (literal > 0) for literal in clause) for clause in clauses)
+
+
+@pytest.mark.parametrize("holes", [3, 4, 5])
+def test_pigeonhole_is_unsatisfiable(holes):
+    solver = Solver(*_pigeonhole(holes))
+    assert solver.solve() is None
+    assert solver.conflicts > 0
+
+
+def test_empty_and_unit_clauses():
+    assert Solver(1, [[1], [-1]]).solve() is None
+    assert Solver(2, [[1, -1], [2]]).solve() == {1: False, 2: True}
+    assert Solver(1, [[]]).solve() is None
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_encoding_is_equisatisfiable(seed):
+    generator = random.Random(seed)
+    for _ in range(40):
+        formula = parse_formula(_random_formula(generator, 5))
+        compiled = formula.compile()
+        cnf = tseitin(formula)
+        model = find_model(formula)
+        expected = any(compiled(values) for values in itertools.product((0, 1), repeat=len(compiled.variables)))
+        assert (model is not None) == expected
+        if model is not None:
+            assert compiled(tuple(model[letter] for letter in compiled.variables)) == 1
+        assert set(cnf.variables) == set(compiled.variables)
+
+
+def test_shared_subformulas_are_defined_once():
+    cnf = tseitin(parse_formula("((p and q) <=> ~(p and q))"))
+    assert cnf.count == 4
+    assert len(cnf.clauses) == 3 + 4
+
+
+@pytest.mark.parametrize("logical_expression", load_logical_expressions())
+def test_samples(logical_expression):
+    assert check_if_tautology("~" + logical_expression, engine="sat")
+    assert check_sat(parse_formula(logical_expression)).verdict == TAUTOLOGY
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_engines_agree(seed):
+    generator = random.Random(seed)
+    for _ in range(40):
+        negated = "~" + _random_formula(generator, 5)
+        assert check_if_tautology(negated, engine="sat") == check_with_table(negated), negated
+
+
+def test_counterexample_falsifies_the_formula():
+    result = check_formula("((p => q) => (q => p))", engine="sat")
+    assert result.verdict == SATISFIABLE
+    assert result.counterexample == {"p": 0, "q": 1}
+    assert check_formula("(p and ~p)", engine="sat").verdict == CONTRADICTION
+
+
+def test_hundreds_of_variables():
+    count = 300
+    premises = "(p1 => p2)"
+    for index in range(2, count):
+        premises = f"({premises} and (p{index} => p{index + 1}))"
+    assert check_formula(f"({premises} => (p1 => p{count}))", engine="sat").verdict == TAUTOLOGY
+    result = check_formula(f"({premises} => (p{count} => p1))", engine="sat")
+    assert result.verdict == SATISFIABLE
+    assert result.counterexample["p1"] == 0 and result.counterexample[f"p{count}"] == 1
+
+
+def test_budget():
+    holes = 6
+    pigeons = [
+        "(" * (holes - 1) + f"p{pigeon * holes + 1}" + "".join(f" or p{pigeon * holes + hole + 1})" for hole in range(1, holes))
+        for pigeon in range(holes + 1)
+    ]
+    formula = pigeons[0]
+    for pigeon in pigeons[1:]:
+        formula = f"({formula} and {pigeon})"
+    for hole in range(holes):
+        for first, second in itertools.combinations(range(holes + 1), 2):
+            formula = f"({formula} and ~(p{first * holes + hole + 1} and p{second * holes + hole + 1}))"
+    result = check_formula(formula, engine="sat", budget=Budget(max_branches=10))
+    assert result.verdict == UNKNOWN
+    assert result.stats["reason"] == "branches"
+    assert check_if_tautology("~" + formula, engine="sat", budget=Budget(max_nodes=5)) is None
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        check_if_tautology("~(p or ~p)", engine="zdd")
+    with pytest.raises(ValueError):
+        check_if_tautology("~(p or ~p)", trace=True, engine="sat")
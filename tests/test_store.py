@@ -0,0 +1,75 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from alphabetalogic import store as store_module
+from alphabetalogic.cache import ResultCache
+from alphabetalogic.results import SATISFIABLE, TAUTOLOGY, CheckResult
+from alphabetalogic.store import ResultStore
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("the check ran again")
+
+
+def _check_in_worker(path, formula):
+    cache = ResultCache(store=ResultStore(path))
+    return cache.check_if_tautology(formula)
+
+
+def test_round_trip(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    assert store.get("tableau", "(p or ~p)") is None
+    store.put("tableau", "(p or ~p)", True)
+    store.put("table", "(p or ~p)", False)
+    store.put("formula:rows", "(p => p1)", CheckResult(SATISFIABLE, {"p": 1, "p1": 0}, {"rows": 3}))
+    assert store.get("tableau", "(p or ~p)") is True
+    assert store.get("table", "(p or ~p)") is False
+    assert store.get("formula:rows", "(p => p1)") == CheckResult(SATISFIABLE, {"p": 1, "p1": 0})
+    assert len(store) == 3
+
+
+def test_results_survive_a_restart(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.db")
+    assert ResultCache(store=ResultStore(path)).check_if_tautology("~((p and (p => q)) => q)")
+
+    monkeypatch.setattr("alphabetalogic.cache.check_if_tautology", _fail)
+    cache = ResultCache(store=ResultStore(path))
+    assert cache.check_if_tautology("~((r and (r => s)) => s)")
+    assert cache.check_if_tautology("~((r and (r => s)) => s)")
+    assert (cache.hits, cache.misses, cache.store_hits) == (2, 0, 1)
+
+
+def test_engine_version_is_part_of_the_key(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / "results.db"))
+    store.put("tableau", "(p or ~p)", True)
+    monkeypatch.setattr(store_module, "ENGINE_VERSION", store_module.ENGINE_VERSION + 1)
+    assert store.get("tableau", "(p or ~p)") is None
+    assert len(store) == 0
+
+
+def test_counterexample_in_the_names_of_the_query(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.db")
+    result = ResultCache(store=ResultStore(path)).check_formula("(q => p)", engine="rows")
+    assert result.counterexample == {"p": 0, "q": 1}
+
+    monkeypatch.setattr("alphabetalogic.cache.check_formula", _fail)
+    result = ResultCache(store=ResultStore(path)).check_formula("(s => r)", engine="rows")
+    assert result.verdict == SATISFIABLE
+    assert result.counterexample == {"r": 0, "s": 1}
+
+
+def test_shared_between_processes(tmp_path):
+    path = str(tmp_path / "results.db")
+    formulas = ["~(p or ~p)", "~(p => q)", "~((p and q) => p)", "~(p and q)"] * 4
+    with ProcessPoolExecutor(2) as executor:
+        results = list(executor.map(_check_in_worker, [path] * len(formulas), formulas))
+    assert results == [True, False, True, False] * 4
+    assert len(ResultStore(path)) == 4
+
+
+@pytest.mark.parametrize("engine", ["tableau", "bitslice"])
+def test_verdicts_through_the_store(tmp_path, engine):
+    path = str(tmp_path / "results.db")
+    assert ResultCache(store=ResultStore(path)).check_formula("(p or ~p)", engine).verdict == TAUTOLOGY
+    assert ResultCache(store=ResultStore(path)).check_formula("(q or ~q)", engine).verdict == TAUTOLOGY
@@ -0,0 +1,195 @@
+import random
+
+import pytest
+
+from alphabetalogic.formula import Conjunction, Variable
+from alphabetalogic.parser import parse_formula
+from alphabetalogic.tableaux import Tree, check_contradictions, check_if_tautology, check_with_table
+from alphabetalogic.tableaux_expander import is_alpha
+from alphabetalogic.utils import GraphVisualizer, Vertex
+
+
+def _grown_tree(logical_expression, priority=None):
+    formula = parse_formula(logical_expression)
+    tree = Tree(priority)
+    tree.root = [formula]
+    tree.stack = tree.expander.clear([formula])
+    tree.grow()
+    return tree
+
+
+def _scanned_leaves(edges, start_node):
+    successors = [edge.end for edge in edges if edge.beg is start_node]
+    if not successors:
+        return [start_node]
+    return [leaf for successor in successors for leaf in _scanned_leaves(edges, successor)]
+
+
+def test_indexes_match_edges():
+    tree = _grown_tree("((p or q) and ((r => p) <=> ~q))")
+    assert len(tree.parent) == len(tree.edges)
+    for edge in tree.edges:
+        assert tree.parent[edge.end] is edge.beg
+        assert any(child is edge.end for child in tree.children[edge.beg])
+    leaves = [node for node in tree.parent if node not in tree.children]
+    assert list(tree.leaves) == [leaf for leaf in leaves if leaf not in tree.closed]
+
+    for node in list(tree.children) + tree.root:
+        assert tree.get_end(node) == _scanned_leaves(tree.edges, node)
+        assert tree.find_leaf_nodes(list(tree.edges), node) == _scanned_leaves(tree.edges, node)
+
+
+def test_branch_follows_parents():
+    tree = _grown_tree("((p and q) or ~r)")
+    branches = sorted(sorted(tree.get_branch(leaf, False)) for leaf in tree.leaves)
+    assert branches == [
+        ["((p and q) or ~r)", "(p and q)", "p", "q"],
+        ["((p and q) or ~r)", "~r"],
+    ]
+
+    leaf = next(iter(tree.leaves))
+    tree.get_branch(leaf, True)
+    node = leaf
+    while node is not None:
+        assert tree.colors[node] == "#d77c2b"
+        node = tree.parent.get(node)
+
+
+def test_tree_without_edges():
+    tree = _grown_tree("p")
+    assert tree.edges == []
+    assert tree.get_end(tree.root[0]) == tree.root
+    assert tree.get_branch(tree.root[0], False) == {"p"}
+
+
+def test_wide_tree():
+    logical_expression = "(p1 or q1)"
+    for index in range(2, 13):
+        logical_expression = f"({logical_expression} and (p{index} or q{index}))"
+    tree = _grown_tree(logical_expression)
+    assert len(tree.leaves) == 2 ** 12
+    assert len(tree.get_end(tree.root[0])) == 2 ** 12
+    for leaf in tree.leaves:
+        literals = [exp for exp in tree.get_branch(leaf, False) if "(" not in exp]
+        assert len(literals) == 12
+
+
+def test_closed_branches_are_not_extended():
+    tree = _grown_tree("((p and ~p) and (q or r))")
+    assert not tree.leaves
+    assert all(getattr(node, "letter", None) not in ("q", "r") for node in tree.parent)
+    closing = [node for node in tree.closed if tree.parent[node] not in tree.closed]
+    assert [(node.letter, node.negation) for node in closing] == [("p", True)]
+    assert tree.literals[closing[0]] == (0b1, 0b1)
+
+
+def test_open_branch_literals():
+    tree = _grown_tree("((p or q) and ~p)")
+    # p and q have ids 0 and 1: q is positive and p negative on the open branch
+    assert [tree.literals[leaf] for leaf in tree.leaves] == [(0b10, 0b01)]
+    assert tree.get_open_ends(tree.root[0]) == list(tree.leaves)
+
+
+def _random_formula(generator, depth):
+    if depth == 0 or generator.random() < 0.2:
+        return generator.choice(["p", "q", "r", "~p", "~q"])
+    if generator.random() < 0.15:
+        return "~" + _random_formula(generator, depth - 1)
+    operator = generator.choice(["and", "or", "=>", "<=>"])
+    return f"({_random_formula(generator, depth - 1)} {operator} {_random_formula(generator, depth - 1)})"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_closure_agrees_with_truth_table(seed, capsys):
+    generator = random.Random(seed)
+    for _ in range(40):
+        negated = "~" + _random_formula(generator, 4)
+        assert check_if_tautology(negated, trace=True) == check_with_table(negated), negated
+
+
+def _fifo(formula):
+    return 0
+
+
+def test_alpha_rules_are_applied_first():
+    alpha_first = _grown_tree("((p or q) and (r and s))")
+    fifo = _grown_tree("((p or q) and (r and s))", priority=_fifo)
+    assert len(alpha_first.edges) == 6
+    assert len(fifo.edges) == 8
+    assert sorted(map(alpha_first.literals.get, alpha_first.leaves)) == sorted(
+        map(fifo.literals.get, fifo.leaves)
+    )
+
+
+def test_alpha_first_shrinks_wide_trees():
+    logical_expression = "((p1 or q1) and (r1 and s1))"
+    for index in range(2, 7):
+        logical_expression = f"({logical_expression} and ((p{index} or q{index}) and (r{index} and s{index})))"
+    alpha_first = _grown_tree(logical_expression)
+    fifo = _grown_tree(logical_expression, priority=_fifo)
+    assert len(alpha_first.leaves) == len(fifo.leaves) == 2 ** 6
+    assert len(alpha_first.edges) < len(fifo.edges) / 2
+
+
+def test_priority_is_pluggable():
+    order = []
+
+    def record(formula):
+        order.append(formula.exp)
+        return 0
+
+    _grown_tree("((p or q) and r)", priority=record)
+    assert order == ["((p or q) and r)", "(p or q)"]
+
+
+@pytest.mark.parametrize(
+    "logical_expression,alpha",
+    [("(p and q)", True), ("~(p and q)", False), ("(p or q)", False), ("~(p or q)", True),
+     ("(p => q)", False), ("~(p => q)", True), ("(p <=> q)", False), ("~(p <=> q)", False)],
+)
+def test_is_alpha(logical_expression, alpha):
+    formula = Tree().expander.clear([parse_formula(logical_expression)])[0]
+    assert is_alpha(formula) == alpha
+
+
+def test_deep_formulas_do_not_recurse(capsys):
+    body = "p"
+    for index in range(10000):
+        body = f"({body} or ~p)" if index % 2 else f"(p => {body})"
+    assert check_if_tautology("~" + body, trace=True)
+
+    body = "p"
+    for index in range(10000):
+        body = f"(q => {body})" if index % 2 else f"({body} and q)"
+    tree = _grown_tree(body)
+    assert tree.leaves
+    assert not check_if_tautology("~" + body, trace=True)
+
+
+def test_deep_tree_layout():
+    nodes = [Variable(letter="p") for _ in range(5001)]
+    edges = [Vertex(beg, end, "") for beg, end in zip(nodes, nodes[1:])]
+    visualizer = GraphVisualizer(nodes[0], edges)
+    visualizer.graph.add_edges_from([(edge.beg, edge.end) for edge in edges])
+    positions = visualizer.hierarchy_pos()
+    assert len(positions) == 5001
+    assert positions[nodes[-1]][1] == pytest.approx(-0.2 * 5000)
+
+
+def test_variables_built_by_hand_get_tree_ids():
+    tree = Tree()
+    formula = Conjunction(arguments=[Variable(letter="q"), Variable(letter="r")])
+    tree.root = [formula]
+    tree.stack = [formula]
+    tree.grow()
+    assert tree.variable_ids == {"q": 0, "r": 1}
+    assert [tree.literals[leaf] for leaf in tree.leaves] == [(0b11, 0)]
+
+
+@pytest.mark.parametrize(
+    "expressions,contradiction",
+    [({"p", "~p"}, True), ({"(p and q)", "~(p and q)", "r"}, True), ({"p", "~q", "(p or q)"}, False), (set(), False)],
+)
+def test_check_contradictions(expressions, contradiction, capsys):
+    assert check_contradictions(expressions) == contradiction
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+from test_utils.load_test_samples import load_logical_expressions
+
+from alphabetalogic import tableaux_expander
+from alphabetalogic.formula import Negation
+from alphabetalogic.parser import parse_formula
+from alphabetalogic.tableaux import build_tree, check_if_tautology, check_with_table
+from alphabetalogic.tableaux_decision import TableauStore, tableau_closes
+
+
+def _random_formula(generator, depth):
+    if depth == 0 or generator.random() < 0.2:
+        return generator.choice(["p", "q", "r", "~p", "~q"])
+    if generator.random() < 0.15:
+        return "~" + _random_formula(generator, depth - 1)
+    operator = generator.choice(["and", "or", "=>", "<=>"])
+    return f"({_random_formula(generator, depth - 1)} {operator} {_random_formula(generator, depth - 1)})"
+
+
+@pytest.mark.parametrize("logical_expression", load_logical_expressions())
+def test_samples_close(logical_expression):
+    assert tableau_closes(Negation(arguments=[parse_formula(logical_expression)]))
+    assert not tableau_closes(parse_formula(logical_expression))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_decision_agrees_with_tree_and_table(seed, capsys):
+    generator = random.Random(seed)
+    for _ in range(40):
+        negated = "~" + _random_formula(generator, 5)
+        expected = check_with_table(negated)
+        assert check_if_tautology(negated) == expected, negated
+        assert check_if_tautology(negated, trace=True) == expected, negated
+
+
+def test_decision_builds_no_vertices(monkeypatch, capsys):
+    def fail(*args):
+        raise AssertionError("a Vertex was built")
+
+    monkeypatch.setattr(tableaux_expander, "Vertex", fail)
+    assert check_if_tautology("~((p and (p => q)) => q)")
+    assert not check_if_tautology("~((p or (p => q)) => q)")
+    assert capsys.readouterr().out == ""
+
+
+def test_build_tree_colors_closed_branches():
+    tree = build_tree("~((p and (p => q)) => q)")
+    assert tree.edges
+    assert not tree.leaves
+    assert all(tree.colors[leaf] == "#d77c2b" for leaf in tree.get_end(tree.root[0]))
+
+
+def test_deep_formula():
+    body = "p"
+    for index in range(20000):
+        body = f"({body} or ~p)" if index % 2 else f"(p => {body})"
+    assert check_if_tautology("~" + body)
+
+
+def test_store_records_the_tableau():
+    store = TableauStore()
+    assert tableau_closes(parse_formula("~((p and (p => q)) => q)"), store)
+    assert len(store.closed_leaves) == 2
+    assert len(store.open_leaves) == 0
+    assert store.exp(0) == "~((p and (p => q)) => q)"
+    assert list(store.parent[:1]) == list(store.rule[:1]) == [-1]
+    for leaf in store.closed_leaves:
+        branch = [store.exp(index) for index in store.branch(leaf)]
+        assert branch[0] == store.exp(0)
+        literals = {exp for exp in branch if "(" not in exp}
+        assert any("~" + literal in literals for literal in literals)
+        for index in store.branch(leaf)[1:]:
+            assert store.rule[index] in store.branch(leaf)
+
+
+def test_store_stops_at_the_first_open_branch():
+    store = TableauStore()
+    assert not tableau_closes(parse_formula("((p or q) and ~p)"), store)
+    assert len(store.open_leaves) == 1
+    branch = {store.exp(index) for index in store.branch(store.open_leaves[0])}
+    assert {"~p", "q"} <= branch
+    assert "p" not in branch
@@ -0,0 +1,151 @@
+import io
+import itertools
+
+import pytest
+from test_utils.load_test_samples import load_logical_expressions
+
+from alphabetalogic import truth_table
+from alphabetalogic.parser import parse_formula
+from alphabetalogic.results import CONTRADICTION, SATISFIABLE, TAUTOLOGY
+from alphabetalogic.tableaux import check_with_table
+from alphabetalogic.truth_table import (
+    check_bitsliced,
+    check_parallel,
+    check_rows,
+    find_counterexample,
+    iter_rows,
+    sample_rows,
+    write_truth_table,
+)
+
+
+def _first_false_row(compiled):
+    for combination in itertools.product([0, 1], repeat=len(compiled.variables)):
+        if not compiled(combination):
+            return dict(zip(compiled.variables, combination))
+    return None
+
+
+@pytest.fixture(params=["numpy", "integers"])
+def bit_columns(request, monkeypatch):
+    if request.param == "integers":
+        monkeypatch.setattr(truth_table, "np", None)
+    elif truth_table.np is None:
+        pytest.skip("numpy is not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("logical_expression", load_logical_expressions())
+def test_samples_are_tautologies(logical_expression, bit_columns):
+    result = check_bitsliced(parse_formula(logical_expression))
+    assert result.verdict == TAUTOLOGY
+    assert result.counterexample is None
+
+
+@pytest.mark.parametrize(
+    "logical_expression,verdict",
+    [
+        ("(p and ~p)", CONTRADICTION),
+        ("(p => q)", SATISFIABLE),
+        ("((p1 or (p2 and p3)) <=> ~(p4 => (p5 or (p6 and p7))))", SATISFIABLE),
+        ("((((p1 and p2) and (p3 and p4)) and ((p5 and p6) and p7)) and ~p7)", CONTRADICTION),
+    ],
+)
+def test_verdicts_and_first_falsifying_row(logical_expression, verdict, bit_columns):
+    compiled = parse_formula(logical_expression).compile()
+    for chunk_words in (None, 1):
+        result = check_bitsliced(compiled, chunk_words=chunk_words)
+        assert result.verdict == verdict
+        assert result.counterexample == _first_false_row(compiled)
+
+
+def test_wide_tautology(bit_columns):
+    body = "p1"
+    for index in range(2, 21):
+        body = f"({body} or p{index})"
+    result = check_bitsliced(parse_formula(f"({body} or ~p20)"), chunk_words=256)
+    assert result.is_tautology
+    assert result.stats["rows"] == 2 ** 20
+
+
+def test_check_with_table_engines_agree():
+    assert check_with_table("~(p or ~p)", engine="bitslice")
+    assert not check_with_table("~(p or q)", engine="bitslice")
+
+
+def test_rows_are_lazy_and_stop_at_first_counterexample():
+    compiled = parse_formula("(p1 and p2)").compile()
+    rows = list(iter_rows(compiled, stop_at_false=True))
+    assert rows == [((0, 0), 0)]
+    assert list(iter_rows(compiled)) == [
+        (combination, int(all(combination)))
+        for combination in itertools.product([0, 1], repeat=2)
+    ]
+
+    wide = "p1"
+    for index in range(2, 41):
+        wide = f"({wide} and p{index})"
+    assert find_counterexample(parse_formula(wide)) == {f"p{index}": 0 for index in range(1, 41)}
+
+
+@pytest.mark.parametrize(
+    "logical_expression",
+    ["(p or ~p)", "(p and ~p)", "(p => q)", "((p1 or (p2 and p3)) <=> ~(p4 => (p5 or (p6 and p7))))"],
+)
+def test_row_engine_agrees_with_bitsliced(logical_expression):
+    compiled = parse_formula(logical_expression).compile()
+    result = check_rows(compiled)
+    assert result == check_bitsliced(compiled)
+    assert result.counterexample == _first_false_row(compiled)
+
+
+def test_sample_rows():
+    compiled = parse_formula("(p1 => (p2 or p3))").compile()
+    table = dict(iter_rows(compiled))
+    sample = sample_rows(compiled, 3, seed=1)
+    assert len(sample) == 3
+    assert all(table[combination] == result for combination, result in sample)
+    assert sample == sample_rows(compiled, 3, seed=1)
+    assert sorted(sample) == sample
+    assert len(sample_rows(compiled, 100)) == 8
+
+
+def test_write_truth_table(tmp_path):
+    compiled = parse_formula("(p => q)").compile()
+    stream = io.StringIO()
+    assert write_truth_table(compiled, stream) == 4
+    assert stream.getvalue() == "p\tq\tresult\n0\t0\t1\n0\t1\t1\n1\t0\t0\n1\t1\t1\n"
+
+    path = tmp_path / "table.tsv"
+    write_truth_table(compiled, str(path))
+    assert path.read_text(encoding="UTF-8") == stream.getvalue()
+
+
+def test_check_with_table_does_not_print(capsys):
+    assert check_with_table("~(p or ~p)")
+    assert not check_with_table("~(p or q)")
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize(
+    "logical_expression,verdict",
+    [
+        ("((((p1 or p2) or (p3 or p4)) or ((p5 or p6) or (p7 or p8))) or ~p8)", TAUTOLOGY),
+        ("((((p1 and p2) and (p3 and p4)) and ((p5 and p6) and p7)) and ~p7)", CONTRADICTION),
+        ("((((p1 or p2) or (p3 or p4)) or ((p5 or p6) or (p7 or p8))) and ~p1)", SATISFIABLE),
+    ],
+)
+def test_parallel_shards(logical_expression, verdict, monkeypatch):
+    monkeypatch.setattr(truth_table, "_PARALLEL_MIN_WORDS", 1)
+    compiled = parse_formula(logical_expression).compile()
+    result = check_parallel(compiled, workers=2, shard_bits=2)
+    assert result.verdict == verdict
+    if verdict == TAUTOLOGY:
+        assert result.stats["rows"] == 2 ** len(compiled.variables)
+    if result.counterexample is not None:
+        assert not compiled.evaluate(result.counterexample)
+
+
+def test_parallel_small_table_runs_in_process():
+    assert check_parallel(parse_formula("(p => q)")) == check_bitsliced(parse_formula("(p => q)"))
+    assert check_with_table("~(p or ~p)", engine="parallel")